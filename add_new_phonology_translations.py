@@ -1,7 +1,9 @@
-import json
+import sys
 from pathlib import Path
 
-LOCALES_DIR = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+import locale_registry  # noqa: E402
+from locale_catalog import LocaleCatalog, add  # noqa: E402
 
 # Solo las nuevas 5 claves de traducción para todos los idiomas
 NEW_TRANSLATIONS = {
@@ -99,43 +101,29 @@ NEW_TRANSLATIONS = {
 }
 
 # Add more languages with English as fallback
-ALL_LOCALES = [
-    "ar", "bn", "cs", "de", "el", "en", "es", "fa", "fi", "fr", "gu", 
-    "ha", "he", "hi", "hu", "id", "it", "ja", "jv", "kn", "ko", "ml", 
-    "mr", "ms", "nl", "pa", "pcm", "pl", "pt", "ro", "ru", "sr", "sv", 
-    "sw", "ta", "te", "th", "tl", "tr", "uk", "ur", "vi", "wuu", "yue",
-    "zh-tw", "zh"
-]
+ALL_LOCALES = locale_registry.CODES
 
 def add_new_translations():
     print("Agregando nuevas traducciones de fonología...")
-    
+
+    catalog = LocaleCatalog(codes=ALL_LOCALES)
+
+    # Obtener traducciones para cada idioma o usar inglés como fallback
+    operations = [
+        add(key, {locale: NEW_TRANSLATIONS.get(locale, NEW_TRANSLATIONS["en"]).get(key, value) for locale in ALL_LOCALES})
+        for key, value in NEW_TRANSLATIONS["en"].items()
+    ]
+    changes = catalog.apply(operations)
+
     for locale in ALL_LOCALES:
-        file_path = Path(LOCALES_DIR) / f"{locale}.json"
-        
-        if not file_path.exists():
+        if locale not in catalog:
             print(f"⚠ {locale}.json no existe")
-            continue
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Obtener traducciones para este idioma o usar inglés como fallback
-        translations = NEW_TRANSLATIONS.get(locale, NEW_TRANSLATIONS["en"])
-        
-        added = 0
-        for key, value in translations.items():
-            if key not in data:
-                data[key] = value
-                added += 1
-        
-        if added > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            print(f"✓ {locale}.json: agregadas {added} traducciones")
+        elif locale in changes:
+            print(f"✓ {locale}.json: agregadas {changes[locale]} traducciones")
         else:
             print(f"  {locale}.json: ya actualizado")
-    
+
+    catalog.flush()
     print("\n✓ ¡Proceso completado!")
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-import json
-import os
+import sys
 from pathlib import Path
 
-# Define the base directory for locales
-LOCALES_DIR = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+import locale_registry  # noqa: E402
+from locale_catalog import LocaleCatalog, add  # noqa: E402
 
 # New translation keys to add (English versions)
 NEW_KEYS = {
@@ -610,51 +610,32 @@ TRANSLATIONS = {
 }
 
 # For languages without specific translations, use English as fallback
-ALL_LOCALES = [
-    "ar", "bn", "cs", "de", "el", "en", "es", "fa", "fi", "fr", "gu", 
-    "ha", "he", "hi", "hu", "id", "it", "ja", "jv", "kn", "ko", "ml", 
-    "mr", "ms", "nl", "pa", "pcm", "pl", "pt", "ro", "ru", "sr", "sv", 
-    "sw", "ta", "te", "th", "tl", "tr", "uk", "ur", "vi", "wuu", "yue",
-    "zh-tw", "zh"
-]
+ALL_LOCALES = locale_registry.CODES
 
 def add_translations_to_locale(locale_code):
-    """Add missing translation keys to a specific locale file."""
-    file_path = Path(LOCALES_DIR) / f"{locale_code}.json"
-    
-    if not file_path.exists():
-        print(f"Warning: {file_path} does not exist. Skipping.")
-        return
-    
-    # Read existing translations
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Get translations for this locale, fallback to English
-    locale_translations = TRANSLATIONS.get(locale_code, NEW_KEYS)
-    
-    # Add new keys if they don't exist
-    added_count = 0
-    for key, value in locale_translations.items():
-        if key not in data:
-            data[key] = value
-            added_count += 1
-    
-    # Write back to file
-    if added_count > 0:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        print(f"✓ Added {added_count} translations to {locale_code}.json")
-    else:
-        print(f"  {locale_code}.json already up to date")
+    """Per-key values for a locale, falling back to English."""
+    return TRANSLATIONS.get(locale_code, NEW_KEYS)
 
 def main():
     print("Adding translations to all locale files...")
-    print(f"Locales directory: {LOCALES_DIR}\n")
-    
+    catalog = LocaleCatalog(codes=ALL_LOCALES)
+    print(f"Locales directory: {catalog.locales_dir}\n")
+
+    operations = [
+        add(key, {locale: add_translations_to_locale(locale).get(key, value) for locale in ALL_LOCALES})
+        for key, value in NEW_KEYS.items()
+    ]
+    changes = catalog.apply(operations)
+
     for locale in ALL_LOCALES:
-        add_translations_to_locale(locale)
-    
+        if locale not in catalog:
+            print(f"Warning: {locale}.json does not exist. Skipping.")
+        elif locale in changes:
+            print(f"✓ Added {changes[locale]} translations to {locale}.json")
+        else:
+            print(f"  {locale}.json already up to date")
+
+    catalog.flush()
     print("\n✓ All translations added successfully!")
 
 if __name__ == "__main__":
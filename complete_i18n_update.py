@@ -1,9 +1,13 @@
-import json
-import re
+import argparse
+import sys
 from pathlib import Path
 
-LOCALES_DIR = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
-COMPONENTS_DIR = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\components"
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+import locale_registry  # noqa: E402
+from locale_catalog import LocaleCatalog, add  # noqa: E402
+from codemod import add_codemod_arguments, codemod_from_args  # noqa: E402
+
+COMPONENTS_DIR = Path(__file__).resolve().parent / "src" / "components"
 
 # Traducciones completas para TODOS los idiomas
 ALL_TRANSLATIONS = {
@@ -112,64 +116,32 @@ ALL_TRANSLATIONS = {
     # Para los demás idiomas, usaré inglés como fallback ya que son ejemplos técnicos
 }
 
-ALL_LOCALES = [
-    "ar", "bn", "cs", "de", "el", "en", "es", "fa", "fi", "fr", "gu", 
-    "ha", "he", "hi", "hu", "id", "it", "ja", "jv", "kn", "ko", "ml", 
-    "mr", "ms", "nl", "pa", "pcm", "pl", "pt", "ro", "ru", "sr", "sv", 
-    "sw", "ta", "te", "th", "tl", "tr", "uk", "ur", "vi", "wuu", "yue",
-    "zh-tw", "zh"
-]
+ALL_LOCALES = locale_registry.CODES
 
 def update_locale_files():
     """Agregar traducciones a todos los archivos de idioma"""
     print("Actualizando archivos de idioma...")
-    
+
+    catalog = LocaleCatalog(codes=ALL_LOCALES)
+
+    # Obtener traducciones para cada idioma o usar inglés
+    operations = [
+        add(key, {locale: ALL_TRANSLATIONS.get(locale, ALL_TRANSLATIONS["en"]).get(key, value) for locale in ALL_LOCALES})
+        for key, value in ALL_TRANSLATIONS["en"].items()
+    ]
+    changes = catalog.apply(operations)
+
     for locale in ALL_LOCALES:
-        file_path = Path(LOCALES_DIR) / f"{locale}.json"
-        
-        if not file_path.exists():
+        if locale not in catalog:
             print(f"⚠ {locale}.json no existe")
-            continue
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Obtener traducciones para este idioma o usar inglés
-        translations = ALL_TRANSLATIONS.get(locale, ALL_TRANSLATIONS["en"])
-        
-        added = 0
-        for key, value in translations.items():
-            if key not in data:
-                data[key] = value
-                added += 1
-        
-        if added > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            print(f"✓ {locale}.json: {added} claves agregadas")
+        elif locale in changes:
+            print(f"✓ {locale}.json: {changes[locale]} claves agregadas")
         else:
             print(f"  {locale}.json: ya actualizado")
 
-def update_component(file_path, replacements):
-    """Actualizar un archivo de componente con reemplazos"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original = content
-        for old, new in replacements:
-            content = content.replace(old, new)
-        
-        if content != original:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
-    except Exception as e:
-        print(f"Error actualizando {file_path}: {e}")
-        return False
+    catalog.flush()
 
-def update_all_components():
+def update_all_components(args=None):
     """Actualizar todos los componentes con traducciones"""
     print("\nActualizando componentes...")
     
@@ -216,22 +188,33 @@ def update_all_components():
         ],
     }
     
-    updated_count = 0
+    plan = []
     for filename, replacements in updates.items():
         file_path = Path(COMPONENTS_DIR) / filename
         if file_path.exists():
-            if update_component(file_path, replacements):
-                print(f"✓ {filename}: actualizado")
-                updated_count += 1
-            else:
-                print(f"  {filename}: sin cambios")
-    
-    print(f"\nTotal componentes actualizados: {updated_count}")
+            plan.append((str(file_path), replacements))
+
+    # Los componentes se procesan en paralelo; con --dry-run solo se muestran los diffs
+    args = args or parse_args([])
+    report = codemod_from_args(plan, args)
+    for file_path in report.changed:
+        print(f"✓ {Path(file_path).name}: {'cambios pendientes' if args.dry_run else 'actualizado'}")
+    for file_path, error in report.errors:
+        print(f"Error actualizando {file_path}: {error}")
+
+    print(f"\nTotal componentes actualizados: {len(report.changed)} ({report.skipped} ya procesados)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Actualización masiva de internacionalización")
+    add_codemod_arguments(parser)
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
     print("="*50)
     print("ACTUALIZACIÓN MASIVA DE INTERNACIONALIZACIÓN")
     print("="*50)
-    update_locale_files()
-    update_all_components()
+    args = parse_args()
+    if not args.dry_run:
+        update_locale_files()
+    update_all_components(args)
     print("\n✓ ¡Proceso completado!")
@@ -1,30 +1,33 @@
-import os
-import re
+import argparse
+import sys
+from pathlib import Path
 
-def replace_in_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    original = content
-    content = content.replace('--bg-main', '--background')
-    content = content.replace('--bg-panel', '--surface')
-    content = content.replace('--bg-header', '--elevated')
-    content = content.replace('--text-1', '--text-primary')
-    content = content.replace('--text-2', '--text-secondary')
-    
-    if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✓ {os.path.basename(filepath)}")
-        return True
-    return False
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from codemod import add_codemod_arguments, codemod_from_args, files_under  # noqa: E402
 
-count = 0
-for root, dirs, files in os.walk('src'):
-    for file in files:
-        if file.endswith(('.tsx', '.ts', '.css')):
-            filepath = os.path.join(root, file)
-            if replace_in_file(filepath):
-                count += 1
+# Every rule is applied in a single scan per file; '--text-1' no longer
+# matches inside '--text-10'.
+RULES = [
+    ('--bg-main', '--background'),
+    ('--bg-panel', '--surface'),
+    ('--bg-header', '--elevated'),
+    ('--text-1', '--text-primary'),
+    ('--text-2', '--text-secondary'),
+]
 
-print(f"\nTotal: {count} fichiers modifiés")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rename legacy CSS variables across src.")
+    add_codemod_arguments(parser)
+    args = parser.parse_args()
+
+    plan = [(path, RULES) for path in files_under('src', ('.tsx', '.ts', '.css'))]
+    report = codemod_from_args(plan, args)
+
+    for path in report.changed:
+        print(f"✓ {Path(path).name}")
+    for path, error in report.errors:
+        print(f"✗ {path}: {error}")
+
+    print(f"\nTotal: {len(report.changed)} fichiers modifiés ({report.skipped} déjà traités)")
+    for (old, new), count in sorted(report.hits.items()):
+        print(f"  {old} -> {new}: {count}")
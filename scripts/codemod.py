@@ -0,0 +1,193 @@
+"""
+Run rewrite rules (see rewrite_engine.py) over many source files in parallel.
+
+Files are spread across a process pool. With dry_run=True nothing is written
+and a unified diff of every change is streamed instead; otherwise changed
+files are replaced atomically (see file_transaction.write_file). A cache
+(.cache/codemod.json) remembers, per rule table, the size/mtime and hash of every file already processed, so
+re-running a migration, or running it again after switching branches, skips
+files it has already handled.
+
+Usage:
+    from codemod import files_under, run_codemod
+
+    plan = [(path, RULES) for path in files_under('src', ('.ts', '.tsx', '.css'))]
+    report = run_codemod(plan, dry_run=True)    # prints diffs
+    report.changed, report.hits
+
+plan is a list of (path, rules) pairs, so each file may get its own rules.
+"""
+import bisect
+import difflib
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from file_transaction import load_cache, save_cache, write_file
+from locale_catalog import ROOT_DIR
+from rewrite_engine import Rewriter
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.cache', 'codemod.json')
+CACHE_VERSION = 1
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.cache'}
+
+FileResult = namedtuple('FileResult', 'path table changed diff hits digest size mtime_ns error')
+CodemodReport = namedtuple('CodemodReport', 'changed skipped errors hits')
+
+
+def files_under(root, extensions):
+    """Sorted paths of files below root ending with one of extensions."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        found.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(tuple(extensions)))
+    return sorted(found)
+
+
+def line_finder(text):
+    """Return line_of(offset): the 1-based line of a character offset in text."""
+    line_starts = [0] + [match.end() for match in re.finditer('\n', text)]
+
+    def line_of(offset):
+        return bisect.bisect_right(line_starts, offset)
+
+    return line_of
+
+
+def rules_fingerprint(rules):
+    pairs = list(rules.items() if isinstance(rules, dict) else rules)
+    return hashlib.sha1(json.dumps(pairs, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+# -- worker side ------------------------------------------------------------
+
+_tables = []
+_rewriters = {}
+
+
+def _init_worker(tables):
+    global _tables
+    _tables = tables
+    _rewriters.clear()
+
+
+def _process(task):
+    path, table, known_digest, dry_run = task
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if digest == known_digest:
+            # Already processed; only the mtime moved (checkout, touch).
+            st = os.stat(path)
+            return FileResult(path, table, False, None, {}, digest, st.st_size, st.st_mtime_ns, None)
+
+        rewriter = _rewriters.get(table)
+        if rewriter is None:
+            rewriter = _rewriters[table] = Rewriter(_tables[table])
+        rewriter.hits.clear()
+        content = raw.decode('utf-8')
+        updated = rewriter.rewrite(content)
+        hits = dict(rewriter.hits)
+        changed = updated != content
+
+        diff = None
+        if changed and dry_run:
+            rel = os.path.relpath(path, ROOT_DIR).replace(os.sep, '/')
+            diff = ''.join(difflib.unified_diff(content.splitlines(True), updated.splitlines(True),
+                                                f'a/{rel}', f'b/{rel}'))
+        elif changed:
+            write_file(path, updated)
+            digest = hashlib.sha1(updated.encode('utf-8')).hexdigest()
+        st = os.stat(path)
+        return FileResult(path, table, changed, diff, hits, digest, st.st_size, st.st_mtime_ns, None)
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(path, table, False, None, {}, None, None, None, e)
+
+
+# -- driver -------------------------------------------------------------------
+
+def run_codemod(plan, workers=None, dry_run=False, cache_path=CACHE_PATH, out=sys.stdout):
+    """Apply every (path, rules) pair of plan and return a CodemodReport.
+
+    Diffs (dry run) are written to out as soon as they are ready, in plan
+    order. hits counts replacements per (old, new) rule over all files.
+    cache_path=None disables the skip cache.
+    """
+    tables = []
+    fingerprints = []
+    table_ids = {}
+    tasks = []
+    cache = load_cache(cache_path, CACHE_VERSION) if cache_path else {}
+    skipped = 0
+
+    for path, rules in plan:
+        fingerprint = rules_fingerprint(rules)
+        if fingerprint not in table_ids:
+            table_ids[fingerprint] = len(tables)
+            tables.append(list(rules.items() if isinstance(rules, dict) else rules))
+            fingerprints.append(fingerprint)
+        entry = cache.get(f"{fingerprint}:{os.path.abspath(path)}")
+        if entry:
+            try:
+                st = os.stat(path)
+            except OSError:
+                entry = None
+            else:
+                if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                    skipped += 1
+                    continue
+        tasks.append((path, table_ids[fingerprint], entry['hash'] if entry else None, dry_run))
+
+    changed = []
+    errors = []
+    hits = Counter()
+    if workers is None:
+        workers = min(os.cpu_count() or 1, max(1, len(tasks) // 16))
+
+    if workers > 1:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tables,))
+        results = pool.map(_process, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+    else:
+        pool = None
+        _init_worker(tables)
+        results = map(_process, tasks)
+
+    try:
+        for result in results:
+            if result.error is not None:
+                errors.append((result.path, result.error))
+                continue
+            replacements = dict(tables[result.table])
+            for old, count in result.hits.items():
+                hits[(old, replacements[old])] += count
+            if result.changed:
+                changed.append(result.path)
+                if result.diff:
+                    out.write(result.diff)
+            if not dry_run or not result.changed:
+                key = f"{fingerprints[result.table]}:{os.path.abspath(result.path)}"
+                cache[key] = {'size': result.size, 'mtime_ns': result.mtime_ns, 'hash': result.digest}
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if cache_path:
+        save_cache(cache_path, CACHE_VERSION, cache)
+    return CodemodReport(changed, skipped, errors, hits)
+
+
+def add_codemod_arguments(parser):
+    parser.add_argument('--dry-run', action='store_true', help="print unified diffs instead of writing")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count, at most one per 16 files)")
+    parser.add_argument('--no-cache', action='store_true', help="re-process files already migrated")
+
+
+def codemod_from_args(plan, args):
+    return run_codemod(plan, workers=args.workers, dry_run=args.dry_run,
+                       cache_path=None if args.no_cache else CACHE_PATH)
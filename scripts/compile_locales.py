@@ -0,0 +1,193 @@
+"""
+Compile the locale JSONs into minified, content-hashed production artifacts.
+
+    python scripts/compile_locales.py               # -> public/locales/compiled/
+    python scripts/compile_locales.py --check       # also verify every artifact round-trips
+
+Each compiled locale is one JSON document without whitespace:
+
+    {"v": 1,
+     "values": ["Cancel", ["Found ", ["count"], " words"], ...],
+     "tree": {"common": {"cancel": 0, "close": "Close"}, "lexicon": {"found": 1}}}
+
+    - a string leaf is the value itself
+    - an integer leaf indexes "values"; a value used by two or more keys is
+      stored there once
+    - a list is a pre-parsed template: strings are literal text and each
+      [name] or [name, format] is one {{name, format}} interpolation, so the
+      runtime never scans for {{ }}
+
+Integers and lists are therefore reserved, so every leaf of a locale must be
+a string; compile_tree raises ValueError for any other value.
+
+Files are named <code>.<hash>.json after their content and listed in
+manifest.json, so a CDN can cache them forever; artifacts no longer listed
+are removed.
+
+Nothing reads this format yet: src/i18n.tsx still bundles src/locales/*.json.
+Serving these artifacts needs a runtime loader that fetches a locale through
+manifest.json and rebuilds its tree the way decompile() does, then hands it
+to i18n.addResourceBundle.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+from file_transaction import write_files
+from locale_catalog import LocaleCatalog
+from split_locales import OUT_DIR
+
+COMPILED_DIR = os.path.join(OUT_DIR, 'compiled')
+FORMAT_VERSION = 1
+HASH_LENGTH = 10
+
+_TEMPLATE_RE = re.compile(r'\{\{(.*?)\}\}')
+
+
+def parse_template(text):
+    """Return text unchanged, or its token list if it interpolates anything."""
+    if '{{' not in text:
+        return text
+    tokens = []
+    position = 0
+    for match in _TEMPLATE_RE.finditer(text):
+        if match.start() > position:
+            tokens.append(text[position:match.start()])
+        name, _, fmt = match.group(1).partition(',')
+        tokens.append([name.strip(), fmt.strip()] if fmt.strip() else [name.strip()])
+        position = match.end()
+    if position < len(text):
+        tokens.append(text[position:])
+    if not any(isinstance(token, list) for token in tokens) or render_template(tokens) != text:
+        # Nothing to interpolate, or unusual spacing the token form would not keep.
+        return text
+    return tokens
+
+
+def render_template(value):
+    """Inverse of parse_template."""
+    if isinstance(value, str):
+        return value
+    parts = []
+    for token in value:
+        if isinstance(token, str):
+            parts.append(token)
+        else:
+            parts.append('{{' + ', '.join(token) + '}}')
+    return ''.join(parts)
+
+
+def _leaves(node):
+    for value in node.values():
+        if isinstance(value, dict):
+            yield from _leaves(value)
+        else:
+            yield value
+
+
+def compile_tree(tree):
+    """Return the compiled document for one locale tree."""
+    counts = Counter(value for value in _leaves(tree) if isinstance(value, str))
+    shared = [value for value, count in counts.items() if count > 1]
+    index = {value: i for i, value in enumerate(shared)}
+
+    def convert(node, prefix):
+        out = {}
+        for name, value in node.items():
+            if isinstance(value, dict):
+                out[name] = convert(value, prefix + name + '.')
+            elif not isinstance(value, str):
+                # An integer would read back as a shared-value reference, a list as a template.
+                raise ValueError(f"{prefix}{name}: {type(value).__name__} value; compiled locales hold strings only")
+            elif value in index:
+                out[name] = index[value]
+            else:
+                out[name] = parse_template(value)
+        return out
+
+    return {'v': FORMAT_VERSION, 'values': [parse_template(value) for value in shared], 'tree': convert(tree, '')}
+
+
+def decompile(document):
+    """Rebuild the plain locale tree from a compiled document."""
+    values = [render_template(value) for value in document['values']]
+
+    def convert(node):
+        out = {}
+        for name, value in node.items():
+            if isinstance(value, dict):
+                out[name] = convert(value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                out[name] = values[value]
+            elif isinstance(value, list):
+                out[name] = render_template(value)
+            else:
+                out[name] = value
+        return out
+
+    return convert(document['tree'])
+
+
+def render(document):
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':'))
+
+
+def compile_locales(out_dir=COMPILED_DIR, catalog=None, check=False):
+    """Write every compiled locale plus manifest.json. Returns the manifest."""
+    catalog = catalog or LocaleCatalog()
+    catalog.normalize_keys()  # in memory only
+
+    manifest = {'version': FORMAT_VERSION, 'locales': {}}
+    contents = {}
+    for code in catalog.codes:
+        try:
+            document = compile_tree(catalog[code])
+        except ValueError as e:
+            raise ValueError(f"{code}: {e}") from None
+        if check and decompile(document) != catalog[code]:
+            raise ValueError(f"{code}: compiled locale does not round-trip")
+        text = render(document)
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        name = f"{code}.{digest}.json"
+        manifest['locales'][code] = {
+            'file': name, 'hash': digest, 'bytes': len(data),
+            'gzip_bytes': len(gzip.compress(data, mtime=0)),
+            'source_bytes': len(catalog.files[code].raw.encode('utf-8')),
+        }
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            contents[path] = text
+
+    contents[os.path.join(out_dir, 'manifest.json')] = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+    os.makedirs(out_dir, exist_ok=True)
+    write_files(contents)
+
+    keep = {entry['file'] for entry in manifest['locales'].values()} | {'manifest.json'}
+    for filename in os.listdir(out_dir):
+        if filename.endswith('.json') and filename not in keep:
+            os.remove(os.path.join(out_dir, filename))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile locales into minified, hashed artifacts.")
+    parser.add_argument('--out', default=COMPILED_DIR, help="output directory (default: public/locales/compiled)")
+    parser.add_argument('--check', action='store_true', help="verify every compiled locale round-trips")
+    args = parser.parse_args()
+
+    manifest = compile_locales(args.out, check=args.check)
+    entries = manifest['locales'].values()
+    source = sum(entry['source_bytes'] for entry in entries)
+    compiled = sum(entry['bytes'] for entry in entries)
+    gzipped = sum(entry['gzip_bytes'] for entry in entries)
+    print(f"{len(manifest['locales'])} locales: {source / 1024:.0f} KB source -> "
+          f"{compiled / 1024:.0f} KB compiled ({gzipped / 1024:.0f} KB gzipped)")
+
+
+if __name__ == "__main__":
+    main()
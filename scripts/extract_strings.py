@@ -0,0 +1,189 @@
+"""
+Move hard-coded strings out of src/components and into en.json in one run.
+
+Takes the findings of find_hardcoded.py, gives every literal a stable key
+under its component's namespace (reusing the en.json key when the same text
+is already there), inserts the new keys into en.json's nested tree and
+replaces each literal with a t('key') call:
+
+    placeholder="e.g. kamra"   ->  placeholder={t('lexicon.kamra_placeholder')}
+    <span>Linked</span>        ->  <span>{t('grammar.linked')}</span>
+    alert('Invalid file')      ->  alert(t('settings.invalid_file_alert'))
+
+Every edit is computed before anything is written; if one literal cannot be
+located the run stops with no file touched. en.json and the components are
+then written as one batch, one write per file. New keys only exist in
+en.json afterwards: run scripts/sync_locales.py to translate them.
+
+Usage:
+    python scripts/extract_strings.py --dry-run
+    python scripts/extract_strings.py --file ScriptEditor.tsx --kind title
+"""
+import argparse
+import difflib
+import os
+import re
+import sys
+
+from file_transaction import write_files
+from find_hardcoded import find_hardcoded
+from locale_catalog import ROOT_DIR, SOURCE_LOCALE, LocaleCatalog
+
+DIALOGS = ('alert', 'confirm', 'prompt')
+_USES_T_RE = re.compile(r'\bconst\s*\{[^}]*\bt\b[^}]*\}\s*=|\bt\s*:\s*\(|[(,]\s*t\s*[,)]')
+
+
+class ExtractionError(ValueError):
+    """A literal reported by the scanner could not be found in its file."""
+
+
+def assign_keys(findings, index):
+    """Return {finding: key}, making generated keys unique.
+
+    A generated key already used in en.json for other text, or generated for
+    two different texts, gets a numeric suffix (_2, _3, ...). The same text
+    in the same namespace always maps to the same key.
+    """
+    keys = {}
+    by_text = {}
+    taken = set(index.keys())
+    for finding in findings:
+        if finding.existing:
+            keys[finding] = finding.key
+            continue
+        namespace = finding.key.split('.', 1)[0]
+        known = by_text.get((namespace, finding.text))
+        if known is None:
+            known = finding.key
+            n = 2
+            while known in taken:
+                known = f"{finding.key}_{n}"
+                n += 1
+            taken.add(known)
+            by_text[(namespace, finding.text)] = known
+        keys[finding] = known
+    return keys
+
+
+def _pattern(finding):
+    text = re.escape(finding.text)
+    if finding.kind == 'text':
+        # Scanner text is whitespace-normalized; the source may wrap it.
+        words = [re.escape(word) for word in finding.text.split()]
+        return re.compile(r'(?<=>)(\s*)(' + r'\s+'.join(words) + r')(?=\s*(?:<|\{))')
+    if finding.kind in DIALOGS:
+        return re.compile(r'\b' + finding.kind + r'\(\s*(["\'`])(' + text + r')\1')
+    return re.compile(r'(?<![\w-])' + re.escape(finding.kind) +
+                      r'\s*=\s*(?:"(' + text + r')"|\{\s*"(' + text + r')"\s*\}|\{\s*\'(' + text + r')\'\s*\})')
+
+
+def _replacement(finding, key):
+    call = f"t('{key}')"
+    if finding.kind == 'text':
+        return '{' + call + '}'
+    if finding.kind in DIALOGS:
+        return f"{finding.kind}({call}"
+    return f"{finding.kind}={{{call}}}"
+
+
+def rewrite_source(content, findings, keys):
+    """Return content with every finding replaced by its t() call."""
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+    edits = []
+    for finding in findings:
+        # A text node's opening '>' may end the previous line.
+        line = finding.line - 1 if finding.kind == 'text' else finding.line
+        match = _pattern(finding).search(content, line_starts[max(line - 1, 0)])
+        if match is None:
+            raise ExtractionError(f"{finding.file}:{finding.line}: cannot find {finding.text!r}")
+        if finding.kind == 'text':
+            start, end = match.span(2)
+        else:
+            start, end = match.span()
+        edits.append((start, end, _replacement(finding, keys[finding])))
+
+    edits.sort()
+    for (_, end, _), (start, _, _) in zip(edits, edits[1:]):
+        if start < end:
+            raise ExtractionError("overlapping literals; run again after fixing the source")
+    for start, end, replacement in reversed(edits):
+        content = content[:start] + replacement + content[end:]
+    return content
+
+
+def extract_strings(files=None, kinds=None, dry_run=False, out=sys.stdout):
+    """Extract the selected findings. Returns {key: text} of the keys added to en.json."""
+    findings = find_hardcoded()
+    if files:
+        findings = [f for f in findings if os.path.basename(f.file) in files]
+    if kinds:
+        findings = [f for f in findings if f.kind in kinds]
+
+    by_file = {}
+    for finding in findings:
+        by_file.setdefault(finding.file, []).append(finding)
+
+    catalog = LocaleCatalog(codes=[SOURCE_LOCALE])
+    contents = {}
+    used = []
+    for rel, items in by_file.items():
+        path = os.path.join(ROOT_DIR, rel)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        if not _USES_T_RE.search(content):
+            print(f"Skipping {rel}: no t() in scope (add useTranslation first)")
+            continue
+        contents[path] = content
+        used.extend(items)
+
+    keys = assign_keys(used, catalog.index(SOURCE_LOCALE))
+    added = {}
+    for finding in used:
+        key = keys[finding]
+        if not finding.existing and catalog.set(SOURCE_LOCALE, key, finding.text, overwrite=False):
+            added[key] = finding.text
+
+    updated = {}
+    for path, content in contents.items():
+        items = [f for f in used if os.path.join(ROOT_DIR, f.file) == path]
+        new_content = rewrite_source(content, items, keys)
+        if new_content != content:
+            updated[path] = new_content
+
+    if dry_run:
+        for path, new_content in updated.items():
+            rel = os.path.relpath(path, ROOT_DIR).replace(os.sep, '/')
+            out.writelines(difflib.unified_diff(contents[path].splitlines(True), new_content.splitlines(True),
+                                                f'a/{rel}', f'b/{rel}'))
+        for key, text in added.items():
+            print(f"+ {key}: {text!r}")
+        return added
+
+    if added:
+        source = catalog.files[SOURCE_LOCALE]
+        updated[source.path] = source.render()
+    write_files(updated)
+    for path in updated:
+        print(f"Updated {os.path.relpath(path, ROOT_DIR)}")
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace hard-coded component strings with t() calls.")
+    parser.add_argument('--file', action='append', metavar='NAME',
+                        help="only this component file name (may be repeated)")
+    parser.add_argument('--kind', action='append', choices=('text', 'placeholder', 'title', 'aria-label', 'alt')
+                        + DIALOGS, help="only this kind of literal (may be repeated)")
+    parser.add_argument('--dry-run', action='store_true', help="print diffs and new keys without writing")
+    args = parser.parse_args()
+
+    try:
+        added = extract_strings(files=args.file, kinds=args.kind, dry_run=args.dry_run)
+    except ExtractionError as e:
+        print(f"Nothing written: {e}")
+        sys.exit(1)
+    print(f"{len(added)} new keys in en.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Crash-safe writes for the Python tools: single files, batches and resumable runs.
+
+write_file(path, text) / open_atomic(path)
+    Writes to a temporary file next to path, fsyncs it and renames it over
+    path, so readers only ever see the old or the new content. open_atomic
+    is the streaming form for outputs too large to build as one string.
+
+FileTransaction (write_files(contents) for the common case)
+    Stages every file of a batch the same way, then records the batch in a
+    journal of its own and renames all staged files. If the process dies
+    during the renames, recover() (run automatically by the next
+    LocaleCatalog) finishes them from the journal; if it dies before the
+    journal is written, nothing was replaced and the staged files are simply
+    discarded. Temporary files and journals carry the writer's process id,
+    and recover() leaves those of running processes alone.
+
+load_cache(path, version) / save_cache(path, version, entries)
+    The versioned {"version", "files"} JSON caches of the scanners, written
+    with write_file.
+
+ProgressJournal
+    Remembers which units of a long run (the locales of a translation run)
+    are already committed, keyed by a fingerprint of the inputs, so an
+    interrupted run can resume instead of starting over.
+
+Usage:
+    with FileTransaction() as tx:
+        tx.stage('src/locales/fr.json', text_fr)
+        tx.stage('src/locales/de.json', text_de)
+    # both renamed here, or neither on error
+"""
+import json
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOURNAL_DIR = os.path.join(ROOT_DIR, '.cache', 'file_transactions')
+TEMP_PREFIX = '.tx-'
+
+
+def _temp_prefix():
+    return f"{TEMP_PREFIX}{os.getpid()}-"
+
+
+def _owner(name):
+    """Process id in a temporary file or journal name ('.tx-<pid>-...', '<pid>-...'), or None."""
+    head = name[len(TEMP_PREFIX):] if name.startswith(TEMP_PREFIX) else name
+    pid = head.split('-', 1)[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    if os.name != 'posix':
+        import ctypes
+        # PROCESS_QUERY_LIMITED_INFORMATION; fails once the process is gone.
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _fsync_dir(directory):
+    # Make the renames themselves durable (not supported on Windows).
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _copy_mode(tmp_path, path):
+    # mkstemp creates 0600 files; give the result the target's mode, or the usual default.
+    if os.path.exists(path):
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+    else:
+        os.chmod(tmp_path, 0o666 & ~_umask())
+
+
+def _stage(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=_temp_prefix(), dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        _copy_mode(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def write_file(path, text):
+    """Replace path with text atomically and durably."""
+    tmp_path = _stage(path, text)
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+@contextmanager
+def open_atomic(path, binary=False):
+    """Yield a file that replaces path when the block completes without error."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=_temp_prefix(), dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8', newline='\n')) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        _copy_mode(tmp_path, path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+def load_cache(path, version):
+    """The entries of a cache file, or {} if it is missing, unreadable or of another version."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != version:
+        return {}
+    return cache.get('files', {})
+
+
+def save_cache(path, version, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_file(path, json.dumps({'version': version, 'files': entries}, ensure_ascii=False))
+
+
+class FileTransaction:
+    """Stage many files, then replace them all together."""
+
+    def __init__(self, journal_dir=JOURNAL_DIR):
+        # One journal per transaction, so concurrent runs never share (or delete) one.
+        self.journal_path = os.path.join(journal_dir, f"{os.getpid()}-{uuid.uuid4().hex}.json")
+        self.staged = {}  # target path -> temporary path
+
+    def stage(self, path, text):
+        path = os.path.abspath(path)
+        previous = self.staged.pop(path, None)
+        if previous:
+            os.unlink(previous)
+        self.staged[path] = _stage(path, text)
+
+    def commit(self):
+        """Rename every staged file into place. Returns the target paths.
+
+        Raises FileNotFoundError, before replacing anything, if a staged file
+        has disappeared.
+        """
+        if not self.staged:
+            return []
+        pairs = [[tmp_path, path] for path, tmp_path in self.staged.items()]
+        missing = [path for tmp_path, path in pairs if not os.path.exists(tmp_path)]
+        if missing:
+            raise FileNotFoundError(f"staged file for {missing[0]} disappeared before commit")
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        write_file(self.journal_path, json.dumps({'renames': pairs}))
+        _apply(pairs)
+        os.remove(self.journal_path)
+        self.staged = {}
+        return [path for _, path in pairs]
+
+    def rollback(self):
+        for tmp_path in self.staged.values():
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        self.staged = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+def _apply(pairs, skip_missing=False):
+    directories = set()
+    for tmp_path, path in pairs:
+        # During recovery, a missing temporary file was already renamed by the interrupted run.
+        if skip_missing and not os.path.exists(tmp_path):
+            continue
+        os.replace(tmp_path, path)
+        directories.add(os.path.dirname(path))
+    for directory in directories:
+        _fsync_dir(directory)
+
+
+def write_files(contents, journal_dir=JOURNAL_DIR):
+    """Write {path: text} as one transaction. Returns the paths written."""
+    with FileTransaction(journal_dir) as tx:
+        for path, text in contents.items():
+            tx.stage(path, text)
+    return list(contents)
+
+
+def recover(journal_dir=JOURNAL_DIR, directories=()):
+    """Finish batches interrupted during their renames; drop orphaned staged files.
+
+    Journals and temporary files of processes still running are left alone.
+    Returns the number of files renamed from journals.
+    """
+    renamed = 0
+    names = os.listdir(journal_dir) if os.path.isdir(journal_dir) else []
+    for name in names:
+        pid = _owner(name)
+        if not name.endswith('.json') or pid is None or _alive(pid):
+            continue
+        journal_path = os.path.join(journal_dir, name)
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                pairs = json.load(f)['renames']
+        except (OSError, ValueError, KeyError):
+            pairs = []
+        renamed += sum(1 for tmp_path, _ in pairs if os.path.exists(tmp_path))
+        _apply(pairs, skip_missing=True)
+        os.remove(journal_path)
+    for directory in directories:
+        for filename in os.listdir(directory):
+            if not filename.startswith(TEMP_PREFIX):
+                continue
+            pid = _owner(filename)
+            if pid is None or not _alive(pid):
+                os.remove(os.path.join(directory, filename))
+    return renamed
+
+
+class ProgressJournal:
+    """Committed units of a resumable run.
+
+    The journal is only honoured while fingerprint matches (same inputs,
+    same options); finish() deletes it once the run is complete. With
+    resume=False an earlier journal is deleted instead of loaded. A None
+    fingerprint (a run that writes nothing) never matches and is never saved.
+    """
+
+    def __init__(self, path, fingerprint, resume=True):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.done = set()
+        if fingerprint is None:
+            return
+        if not resume:
+            self.finish()
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return
+        if journal.get('fingerprint') == fingerprint:
+            self.done = set(journal.get('done', []))
+
+    def __contains__(self, unit):
+        return unit in self.done
+
+    def mark(self, unit):
+        self.done.add(unit)
+        if self.fingerprint is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_file(self.path, json.dumps({'fingerprint': self.fingerprint, 'done': sorted(self.done)}))
+
+    def finish(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.done = set()
@@ -0,0 +1,255 @@
+"""
+Find user-facing strings in src/components that are not wrapped in t(...).
+
+Reports literal placeholder=/title=/aria-label=/alt= attributes, JSX text
+nodes and alert()/confirm()/prompt() messages, each with its file, line and
+a suggested locale key (an existing en.json key when the same English text
+is already translated). Files are scanned in parallel and the findings of
+every file are cached by content hash (.cache/find_hardcoded.json), so
+re-running after an edit only re-scans the files that changed.
+
+    python scripts/find_hardcoded.py                   # rewrite hardcoded_analysis.md
+    python scripts/find_hardcoded.py --json report.json
+    python scripts/find_hardcoded.py --json -          # JSON on stdout only
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from codemod import files_under, line_finder
+from file_transaction import load_cache, save_cache
+from locale_catalog import ROOT_DIR, SOURCE_LOCALE, LocaleCatalog
+from protected_spans import PROTECTED_RE
+
+COMPONENTS_DIR = os.path.join(ROOT_DIR, 'src', 'components')
+MARKDOWN_PATH = os.path.join(ROOT_DIR, 'hardcoded_analysis.md')
+CACHE_PATH = os.path.join(ROOT_DIR, '.cache', 'find_hardcoded.json')
+# Bump when the scanner changes, so cached findings are recomputed.
+SCANNER_VERSION = 2
+
+ATTRIBUTES = ('placeholder', 'title', 'aria-label', 'alt')
+
+# Locale section used for each component's keys (default: lowercased name).
+NAMESPACES = {
+    'ProjectWizard': 'wizard',
+    'PhonologyEditor': 'phonology',
+    'MorphologyEditor': 'morph',
+    'ConstraintsModal': 'val',
+    'GenEvolve': 'genevolve',
+    'GenWord': 'genword',
+    'ScriptEditor': 'script',
+    'SettingsModal': 'settings',
+    'ConsoleConfig': 'console',
+    'ConsoleView': 'console',
+    'GrammarEditor': 'grammar',
+    'WhatsNewModal': 'whats_new',
+}
+
+Finding = namedtuple('Finding', 'file line kind text key existing')
+
+_ATTRIBUTE_RE = re.compile(r'(?<![\w-])(' + '|'.join(ATTRIBUTES) + r')\s*=\s*(?:"([^"\n]*)"|\{\s*"([^"\n]*)"\s*\}|\{\s*\'([^\'\n]*)\'\s*\})')
+_DIALOG_RE = re.compile(r'\b(alert|confirm|prompt)\(\s*(?:"([^"\n]+)"|\'([^\'\n]+)\'|`([^`$\n]+)`)\s*[,)]')
+# Text between the end of a JSX tag and the next tag or {expression}.
+_TEXT_RE = re.compile(r'(?<![=\-])>([^<>{}]+)(?=<|\{)')
+_CODE_CHARS = re.compile(r'&&|\|\||=|;|\(|\)|=>|\breturn\b|\bconst\b')
+_LETTERS = re.compile(r'[^\W\d_]{2,}')
+
+
+def strip_comments(source, blank_strings=False):
+    """Blank out // and /* */ comments, keeping offsets and line numbers.
+
+    "...", '...' and `...` literals are skipped, so // or /* inside them
+    ('http://...') is not taken for a comment. A ' directly after a letter or
+    digit is an apostrophe ("don't"), not a quote. With blank_strings, the
+    contents of the literals are blanked too, so markup-looking text inside
+    strings is not taken for JSX.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    quote = None
+    while i < n:
+        ch = source[i]
+        if quote:
+            if ch == '\\' and i + 1 < n:
+                out.append('  ' if blank_strings and source[i + 1] != '\n' else source[i:i + 2])
+                i += 2
+                continue
+            if ch == quote or (ch == '\n' and quote != '`'):
+                quote = None
+                out.append(ch)
+            else:
+                out.append(' ' if blank_strings and ch != '\n' else ch)
+            i += 1
+            continue
+        if ch == '/' and source.startswith('//', i) and not source.startswith('://', i - 1):
+            end = source.find('\n', i)
+            end = n if end == -1 else end
+            out.append(' ' * (end - i))
+            i = end
+            continue
+        if ch == '/' and source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            out.append(re.sub(r'[^\n]', ' ', source[i:end]))
+            i = end
+            continue
+        if ch in '"`' or (ch == "'" and not (i and source[i - 1].isalnum())):
+            quote = ch
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def scan_source(source):
+    """Return [(line, kind, text)] for the hard-coded strings of one file."""
+    code = strip_comments(source)
+    line_of = line_finder(code)
+
+    found = []
+    for match in _ATTRIBUTE_RE.finditer(code):
+        text = next(group for group in match.groups()[1:] if group is not None)
+        if text.strip():
+            found.append((line_of(match.start()), match.group(1), text))
+    for match in _DIALOG_RE.finditer(code):
+        text = next(group for group in match.groups()[1:] if group is not None)
+        found.append((line_of(match.start()), match.group(1), text))
+    for match in _TEXT_RE.finditer(strip_comments(source, blank_strings=True)):
+        text = ' '.join(match.group(1).split())
+        # Product names and versions alone are not worth a key.
+        if not _LETTERS.search(PROTECTED_RE.sub('', text)) or _CODE_CHARS.search(text):
+            continue
+        offset = match.start(1) + len(match.group(1)) - len(match.group(1).lstrip())
+        found.append((line_of(offset), 'text', text))
+    found.sort()
+    return found
+
+
+def _scan_file(task):
+    path, known = task
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    if known and known['hash'] == digest:
+        return path, known
+    try:
+        findings = scan_source(raw.decode('utf-8'))
+    except UnicodeDecodeError:
+        findings = []
+    return path, {'hash': digest, 'findings': findings}
+
+
+def _slug(text, limit=4):
+    text = re.sub(r'\be\.g\.\s*', '', text.lower())
+    words = re.findall(r'[a-z0-9]+', text)
+    return '_'.join(words[:limit]) or 'text'
+
+
+def namespace_for(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return NAMESPACES.get(name, re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower())
+
+
+def suggest_key(path, kind, text, existing):
+    """Reuse an en.json key holding the same text, else build one from it."""
+    namespace = namespace_for(path)
+    matches = existing.get(text, ())
+    for key in matches:
+        if key.startswith(namespace + '.'):
+            return key, True
+    if matches:
+        return matches[0], True
+    suffix = {'placeholder': '_placeholder', 'title': '_title', 'aria-label': '_label',
+              'alt': '_alt', 'confirm': '_confirm', 'alert': '_alert', 'prompt': '_prompt'}.get(kind, '')
+    return f"{namespace}.{_slug(text)}{suffix}", False
+
+
+def find_hardcoded(root=COMPONENTS_DIR, workers=None, cache_path=CACHE_PATH):
+    """Return the sorted list of Finding for every .ts/.tsx file below root."""
+    paths = files_under(root, ('.ts', '.tsx'))
+    cache = load_cache(cache_path, SCANNER_VERSION) if cache_path else {}
+
+    def rel(path):
+        return os.path.relpath(path, ROOT_DIR).replace(os.sep, '/')
+
+    tasks = [(path, cache.get(rel(path))) for path in paths]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, max(1, len(tasks) // 16))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_scan_file, tasks, chunksize=4))
+    else:
+        results = [_scan_file(task) for task in tasks]
+
+    existing = {}
+    for key, value in LocaleCatalog(codes=[SOURCE_LOCALE]).index(SOURCE_LOCALE).items():
+        existing.setdefault(value, []).append(key)
+
+    entries = {}
+    findings = []
+    for path, entry in results:
+        entries[rel(path)] = entry
+        for line, kind, text in entry['findings']:
+            key, known = suggest_key(path, kind, text, existing)
+            findings.append(Finding(rel(path), line, kind, text, key, known))
+
+    if cache_path:
+        save_cache(cache_path, SCANNER_VERSION, entries)
+    return findings
+
+
+def render_markdown(findings):
+    """hardcoded_analysis.md, grouped by component."""
+    lines = ["# Análisis Completo de Textos Hardcoded", "",
+             "<!-- Generado por scripts/find_hardcoded.py; no editar a mano. -->", "",
+             "## Textos Hardcoded Encontrados", ""]
+    by_file = {}
+    for finding in findings:
+        by_file.setdefault(finding.file, []).append(finding)
+    for path, items in by_file.items():
+        lines.append(f"### {os.path.relpath(path, 'src/components')}")
+        for finding in items:
+            if finding.kind == 'text':
+                shown = finding.text
+            elif finding.kind in ('alert', 'confirm', 'prompt'):
+                shown = f'{finding.kind}("{finding.text}")'
+            else:
+                shown = f'{finding.kind}="{finding.text}"'
+            note = " (ya existe)" if finding.existing else ""
+            lines.append(f"- `{shown}` - Línea {finding.line} → `{finding.key}`{note}")
+        lines.append("")
+    lines.append(f"## Total: {len(findings)} textos hardcoded que necesitan traducción")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report strings in src/components not wrapped in t(...).")
+    parser.add_argument('--json', metavar='PATH', help="write the report as JSON ('-' for stdout)")
+    parser.add_argument('--markdown', default=MARKDOWN_PATH, metavar='PATH',
+                        help="markdown report to regenerate (default: hardcoded_analysis.md)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes")
+    parser.add_argument('--no-cache', action='store_true', help="re-scan every file")
+    args = parser.parse_args()
+
+    findings = find_hardcoded(workers=args.workers, cache_path=None if args.no_cache else CACHE_PATH)
+
+    if args.json:
+        report = json.dumps([finding._asdict() for finding in findings], ensure_ascii=False, indent=2)
+        if args.json == '-':
+            sys.stdout.write(report + '\n')
+            return
+        with open(args.json, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(report + '\n')
+    with open(args.markdown, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(render_markdown(findings))
+    files = len({finding.file for finding in findings})
+    print(f"{len(findings)} hard-coded strings in {files} files -> {os.path.relpath(args.markdown)}")
+
+
+if __name__ == "__main__":
+    main()
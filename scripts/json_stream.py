@@ -0,0 +1,308 @@
+"""
+Streaming JSON reading and writing for files too large to load whole.
+
+JsonReader parses a text file incrementally from fixed-size chunks. Objects
+and arrays can be walked member by member; each member is either decoded
+(read_value), skipped without being built (skip_value) or walked further,
+so memory stays bounded by the largest member actually decoded rather than
+by the file. JsonWriter emits the same structures piece by piece.
+
+Usage:
+    with open('project.json', encoding='utf-8') as f:
+        for entry in iter_path(f, 'lexicon'):   # one lexicon entry at a time
+            ...
+
+    transform_array('project.json', 'out.json', 'lexicon', fix_entry)
+
+Walking rules: after an iter_object()/iter_array() step the caller may
+consume the member's value; if it does not, the value is skipped. Nested
+iterators must be run to the end before the outer one resumes.
+"""
+import argparse
+import json
+
+from file_transaction import open_atomic
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class JsonStreamError(ValueError):
+    """The stream is not the JSON structure the caller walked."""
+
+
+class JsonReader:
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._offset = 0  # characters dropped from the front of _buf
+        self._pending = False
+        self._decoder = json.JSONDecoder()
+
+    # -- buffer -------------------------------------------------------------
+
+    def _fill(self, size=None):
+        """Read more text. Returns False at end of file."""
+        if self._eof:
+            return False
+        data = self.fp.read(max(size or 0, self.chunk_size))
+        self._offset += self._pos
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        if not data:
+            self._eof = True
+        return bool(data)
+
+    def _peek(self):
+        """Next non-whitespace character without consuming it ('' at end)."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars):
+        ch = self._peek()
+        if not ch or ch not in chars:
+            found = repr(ch) if ch else 'end of file'
+            raise JsonStreamError(f"expected {' or '.join(map(repr, chars))} at offset "
+                                  f"{self._offset + self._pos}, found {found}")
+        self._pos += 1
+        return ch
+
+    def _decode(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if not self._fill(len(self._buf) - self._pos):
+                    raise JsonStreamError(f"{e.msg} at offset {self._offset + e.pos}") from None
+                continue
+            # A number running into the end of the buffer may continue in the next chunk.
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and not self._buf[end:].strip(_NUMBER_CHARS) and self._fill()):
+                continue
+            self._pos = end
+            return value
+
+    # -- reading ------------------------------------------------------------
+
+    def read_value(self):
+        """Decode the next value completely."""
+        self._pending = False
+        return self._decode()
+
+    def skip_value(self):
+        """Move past the next value without building it."""
+        self._pending = False
+        if self._peek() not in '{[':
+            self._decode()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            buf = self._buf
+            pos = self._pos
+            end = len(buf)
+            while pos < end:
+                ch = buf[pos]
+                if in_string:
+                    if ch == '\\':
+                        if pos + 1 == end:
+                            break
+                        pos += 2
+                        continue
+                    if ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch in '{[':
+                    depth += 1
+                elif ch in '}]':
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = pos + 1
+                        return
+                pos += 1
+            self._pos = pos
+            if not self._fill():
+                raise JsonStreamError("unexpected end of file inside a value")
+
+    def iter_object(self):
+        """Yield the keys of the next object; consume each value after its key."""
+        self._pending = False
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise JsonStreamError(f"object key expected at offset {self._offset + self._pos}")
+            self._expect(':')
+            self._pending = True
+            yield key
+            if self._pending:
+                self.skip_value()
+            if self._expect(',}') == '}':
+                return
+
+    def iter_array(self):
+        """Yield the indices of the next array; consume each item after its index."""
+        self._pending = False
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            self._pending = True
+            yield index
+            if self._pending:
+                self.skip_value()
+            index += 1
+            if self._expect(',]') == ']':
+                return
+
+    def iter_items(self):
+        """Yield every item of the next array, decoded one at a time."""
+        for _ in self.iter_array():
+            yield self.read_value()
+
+
+def iter_path(fp, path, chunk_size=CHUNK_SIZE):
+    """Yield the items of the array at a dotted path of object keys ('lexicon')."""
+    reader = JsonReader(fp, chunk_size)
+    parts = path.split('.') if path else []
+
+    def walk(depth):
+        if depth == len(parts):
+            yield from reader.iter_items()
+            return
+        for key in reader.iter_object():
+            if key == parts[depth]:
+                yield from walk(depth + 1)
+
+    yield from walk(0)
+
+
+class JsonWriter:
+    """Write JSON piece by piece. Scalars and whole values go through json.dumps."""
+
+    def __init__(self, fp, indent=2):
+        self.fp = fp
+        self.indent = indent
+        self._stack = []  # [kind, member count]
+        self._after_key = False
+
+    def _separator(self):
+        if self._after_key:
+            self._after_key = False
+            return
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        if frame[1]:
+            self.fp.write(',')
+        frame[1] += 1
+        if self.indent is not None:
+            self.fp.write('\n' + ' ' * (self.indent * len(self._stack)))
+
+    def _close(self, kind, bracket):
+        if not self._stack or self._stack[-1][0] != kind:
+            raise JsonStreamError(f"unbalanced {bracket!r}")
+        _, count = self._stack.pop()
+        if count and self.indent is not None:
+            self.fp.write('\n' + ' ' * (self.indent * len(self._stack)))
+        self.fp.write(bracket)
+
+    def begin_object(self):
+        self._separator()
+        self.fp.write('{')
+        self._stack.append(['object', 0])
+
+    def end_object(self):
+        self._close('object', '}')
+
+    def begin_array(self):
+        self._separator()
+        self.fp.write('[')
+        self._stack.append(['array', 0])
+
+    def end_array(self):
+        self._close('array', ']')
+
+    def key(self, name):
+        if not self._stack or self._stack[-1][0] != 'object':
+            raise JsonStreamError("key outside an object")
+        self._separator()
+        self.fp.write(json.dumps(name, ensure_ascii=False) + (': ' if self.indent is not None else ':'))
+        self._after_key = True
+
+    def value(self, obj):
+        """Write one whole value (on a single line when indenting)."""
+        self._separator()
+        separators = (', ', ': ') if self.indent is not None else (',', ':')
+        self.fp.write(json.dumps(obj, ensure_ascii=False, separators=separators))
+
+
+def transform_array(src, dst, path, fn, indent=2, chunk_size=CHUNK_SIZE):
+    """Copy src to dst, passing each item of the array at path through fn.
+
+    fn returns the new item, or None to drop it. Other members are copied as
+    values. dst may be src: the output goes to a temporary file that replaces
+    it only once complete. Returns (items read, items written).
+    """
+    parts = path.split('.')
+    counts = [0, 0]
+    with open(src, 'r', encoding='utf-8') as fin, open_atomic(dst) as fout:
+        reader = JsonReader(fin, chunk_size)
+        writer = JsonWriter(fout, indent)
+
+        def copy(depth):
+            if depth == len(parts):
+                writer.begin_array()
+                for item in reader.iter_items():
+                    counts[0] += 1
+                    item = fn(item)
+                    if item is not None:
+                        counts[1] += 1
+                        writer.value(item)
+                writer.end_array()
+                return
+            writer.begin_object()
+            for key in reader.iter_object():
+                writer.key(key)
+                if key == parts[depth]:
+                    copy(depth + 1)
+                else:
+                    writer.value(reader.read_value())
+            writer.end_object()
+
+        copy(0)
+        fout.write('\n')
+    return tuple(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the items of a JSON array without loading the file.")
+    parser.add_argument('file')
+    parser.add_argument('path', help="dotted path of the array, e.g. lexicon")
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        count = sum(1 for _ in iter_path(f, args.path))
+    print(f"{args.path}: {count} items")
+
+
+if __name__ == "__main__":
+    main()
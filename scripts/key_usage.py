@@ -0,0 +1,143 @@
+"""
+Join the t() call sites of src against the locale catalog.
+
+Reports:
+
+    dead      en.json keys no source file refers to
+    missing   keys passed to t('...') that en.json does not define
+    dynamic   t() calls whose key is computed (t(`pos.${key}`), t(item.titleKey))
+
+A key counts as used when it appears in a static t('...') call, when a
+string literal anywhere in src equals it (keys kept in tables and passed to
+t() later), or when a dynamic call can produce it: each ${...} of a template
+stands for one key segment, so t(`pos.${key}`) keeps every pos.* key alive.
+
+    python scripts/key_usage.py
+    python scripts/key_usage.py --json -
+    python scripts/key_usage.py --prune          # delete dead keys from every locale
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from codemod import files_under, line_finder
+from locale_catalog import LocaleCatalog, ROOT_DIR, SOURCE_LOCALE, delete
+
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+CallSite = namedtuple('CallSite', 'file line key')
+# keeps: the keys the call can produce, as a glob ('pos.*', 'phonology.*.*'), or ''.
+DynamicSite = namedtuple('DynamicSite', 'file line expression keeps')
+KeyUsage = namedtuple('KeyUsage', 'used dead missing dynamic')
+
+_T_CALL_RE = re.compile(r'(?<![\w.$])(?:i18n\.)?t\(\s*(?:(["\'])((?:(?!\1)[^\\\n])*)\1(\s*\+)?|`([^`]*)`|([^)\s,][^),]*))')
+_LITERAL_RE = re.compile(r'(["\'])([\w-]+(?:\.[\w-]+)+)\1')
+_PLACEHOLDER_RE = re.compile(r'\$\{(?:[^{}]|\{[^{}]*\})*\}')
+
+
+def keeps_pattern(glob):
+    """Regex for a keeps glob: '*' matches within one key segment, a trailing '+' anything."""
+    parts = [re.escape(part) for part in glob.rstrip('+').split('*')]
+    return re.compile('[^.]*'.join(parts) + ('.*' if glob.endswith('+') else '') + '$')
+
+
+def scan_calls(source, path):
+    """Return (static call sites, dynamic call sites, dotted string literals) of one file."""
+    line_of = line_finder(source)
+
+    static = []
+    dynamic = []
+    for match in _T_CALL_RE.finditer(source):
+        quoted, concatenated, template, expression = match.group(2, 3, 4, 5)
+        line = line_of(match.start())
+        if concatenated:
+            dynamic.append(DynamicSite(path, line, f"'{quoted}' + ...", quoted + '*+'))
+        elif quoted is not None:
+            static.append(CallSite(path, line, quoted))
+        elif template is not None and '${' not in template:
+            static.append(CallSite(path, line, template))
+        elif template is not None:
+            dynamic.append(DynamicSite(path, line, f"`{template}`", _PLACEHOLDER_RE.sub('*', template)))
+        else:
+            dynamic.append(DynamicSite(path, line, expression.strip(), ''))
+    literals = {match.group(2) for match in _LITERAL_RE.finditer(source)}
+    return static, dynamic, literals
+
+
+def analyze(catalog=None, src_dir=SRC_DIR):
+    """Return a KeyUsage for the en.json keys of catalog."""
+    catalog = catalog or LocaleCatalog(codes=[SOURCE_LOCALE])
+    keys = set(catalog.index(SOURCE_LOCALE).keys())
+
+    static = []
+    dynamic = []
+    literals = set()
+    locales_dir = os.path.join(src_dir, 'locales')
+    for path in files_under(src_dir, ('.ts', '.tsx')):
+        if path.startswith(locales_dir):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        rel = os.path.relpath(path, ROOT_DIR).replace(os.sep, '/')
+        file_static, file_dynamic, file_literals = scan_calls(source, rel)
+        static.extend(file_static)
+        dynamic.extend(file_dynamic)
+        literals |= file_literals
+
+    called = {site.key for site in static}
+    patterns = [keeps_pattern(glob) for glob in {site.keeps for site in dynamic if site.keeps}]
+    used = {key for key in keys
+            if key in called or key in literals or any(pattern.match(key) for pattern in patterns)}
+    dead = sorted(keys - used)
+    missing = sorted((site for site in static if site.key not in keys), key=lambda s: (s.key, s.file, s.line))
+    return KeyUsage(sorted(used), dead, missing, dynamic)
+
+
+def prune(catalog, dead):
+    """Delete dead keys from every locale; returns the codes written."""
+    catalog.apply(delete(key) for key in dead)
+    return catalog.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report dead, missing and dynamic locale keys.")
+    parser.add_argument('--json', metavar='PATH', help="write the report as JSON ('-' for stdout)")
+    parser.add_argument('--prune', action='store_true', help="delete dead keys from every locale file")
+    args = parser.parse_args()
+
+    catalog = LocaleCatalog() if args.prune else None
+    usage = analyze(catalog)
+
+    if args.json:
+        report = json.dumps({
+            'dead': usage.dead,
+            'missing': [site._asdict() for site in usage.missing],
+            'dynamic': [site._asdict() for site in usage.dynamic],
+        }, ensure_ascii=False, indent=2)
+        if args.json == '-':
+            sys.stdout.write(report + '\n')
+        else:
+            with open(args.json, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(report + '\n')
+    else:
+        print(f"Dead keys ({len(usage.dead)}):")
+        for key in usage.dead:
+            print(f"  {key}")
+        print(f"Missing keys ({len(usage.missing)}):")
+        for site in usage.missing:
+            print(f"  {site.key}  ({site.file}:{site.line})")
+        print(f"Dynamic t() calls ({len(usage.dynamic)}):")
+        for site in usage.dynamic:
+            kept = f" keeps {site.keeps.rstrip('+')}" if site.keeps else ""
+            print(f"  {site.file}:{site.line}  t({site.expression}){kept}")
+
+    if args.prune:
+        written = prune(catalog, usage.dead)
+        print(f"Pruned {len(usage.dead)} dead keys from {len(written)} locale files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Check a whole project lexicon against its ProjectConstraints, the way the
+Lexicon view checks a single word (checkConformance in
+src/components/Lexicon.tsx).
+
+The constraints are compiled once. Banned sequences become one trie-shaped
+pattern (see rewrite_engine.py) that rejects most words in a single scan.
+The grapheme class and the phonotactic structure are each one regex. The C/V
+class of every character is memoized. mustStartWith/mustEndWith rules are
+grouped per part of speech. Words are then checked column by column, in
+chunks spread across worker processes for large lexicons.
+
+    python scripts/lexicon_constraints.py resources/sindarin_complete.json
+    python scripts/lexicon_constraints.py big.json --workers 8 --json -
+
+Usage:
+    from lexicon_constraints import validate_lexicon
+
+    violations = validate_lexicon(project.lexicon, project.get('constraints'), project.get('phonology'))
+    for v in violations:
+        v.row, v.id, v.kind, v.detail      # kind: 'banned_seq', 'structure_fail', ...
+
+Each kind is the val.* locale key the app shows for that violation.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from locale_catalog import SOURCE_LOCALE, LocaleCatalog
+from project_file import load_project
+from rewrite_engine import compile_rules
+
+# Fallback vowel letters of Lexicon.tsx, used next to the phonology's inventory.
+DEFAULT_VOWELS = 'aeiouàáèéìíòóùú'
+# Defaults the app applies to a project's constraints (INITIAL_CONSTRAINTS in useProject.ts).
+DEFAULT_CONSTRAINTS = {
+    'allowDuplicates': True,
+    'caseSensitive': False,
+    'bannedSequences': [],
+    'allowedGraphemes': '',
+    'phonotacticStructure': '',
+    'mustStartWith': [],
+    'mustEndWith': [],
+}
+CHUNK_ROWS = 20000
+
+Violation = namedtuple('Violation', 'row id kind detail')
+
+
+def phoneme_symbols(instances):
+    """Symbols of PhonemeInstance entries (or of older {symbol: ...} entries)."""
+    for instance in instances or ():
+        phoneme = instance.get('phoneme')
+        symbol = phoneme.get('symbol') if isinstance(phoneme, dict) else instance.get('symbol')
+        if symbol:
+            yield symbol
+
+
+class ConstraintChecker:
+    """A project's constraints, compiled once. check(word, pos) mirrors checkConformance."""
+
+    def __init__(self, constraints, phonology=None):
+        constraints = {**DEFAULT_CONSTRAINTS, **(constraints or {})}
+        phonology = phonology or {}
+        self.case_sensitive = bool(constraints['caseSensitive'])
+        self.allow_duplicates = bool(constraints['allowDuplicates'])
+        self.warnings = []
+
+        # Empty sequences are skipped: the app would flag every word with them.
+        self.banned = [(seq, seq if self.case_sensitive else seq.lower())
+                       for seq in constraints['bannedSequences'] or () if seq]
+        self._banned_re = compile_rules([check for _, check in self.banned], token_chars='') if self.banned else None
+
+        self.allowed = constraints['allowedGraphemes'] or ''
+        self._allowed_re = None
+        if self.allowed:
+            try:
+                flags = 0 if self.case_sensitive else re.IGNORECASE
+                self._allowed_re = re.compile(f"^['{self.allowed}]+$", flags)
+            except re.error as e:
+                self.warnings.append(f"allowedGraphemes ignored: {e}")
+
+        self._structure_re = None
+        if constraints['phonotacticStructure']:
+            try:
+                self._structure_re = re.compile(constraints['phonotacticStructure'])
+            except re.error as e:
+                self.warnings.append(f"phonotacticStructure ignored: {e}")
+
+        self._vowels = frozenset(phoneme_symbols(phonology.get('vowels')))
+        self._consonants = frozenset(phoneme_symbols(phonology.get('consonants')))
+        self._cv = {}
+        self._rules = {'start': constraints['mustStartWith'] or [], 'end': constraints['mustEndWith'] or []}
+        self._rules_by_pos = {}
+
+    # -- phoneme classes (isConsonant, isVowel, getCVPattern) ---------------
+
+    def is_consonant(self, ch):
+        return ch in self._consonants or ch.lower() not in DEFAULT_VOWELS
+
+    def is_vowel(self, ch):
+        return ch in self._vowels or ch.lower() in DEFAULT_VOWELS
+
+    def cv_pattern(self, word):
+        cv = self._cv
+        pattern = []
+        for ch in word:
+            cls = cv.get(ch)
+            if cls is None:
+                if ch in self._vowels:
+                    cls = 'V'
+                elif ch in self._consonants:
+                    cls = 'C'
+                else:
+                    cls = 'V' if ch.lower() in DEFAULT_VOWELS else 'C'
+                cv[ch] = cls
+            pattern.append(cls)
+        return ''.join(pattern)
+
+    def _edge_rules(self, edge, pos):
+        """(literal targets, wants C, wants V) of the rules applying to pos, or None."""
+        key = (edge, pos)
+        if key not in self._rules_by_pos:
+            targets = [rule.get('target', '') for rule in self._rules[edge]
+                       if not rule.get('conditionPos') or rule.get('conditionPos') == pos]
+            self._rules_by_pos[key] = (
+                (tuple(t for t in targets if t not in ('C', 'V')), 'C' in targets, 'V' in targets)
+                if targets else None)
+        return self._rules_by_pos[key]
+
+    def _edge_ok(self, rules, ch, matches):
+        literals, wants_c, wants_v = rules
+        return ((wants_c and self.is_consonant(ch)) or (wants_v and self.is_vowel(ch))
+                or matches(literals))
+
+    # -- checks -------------------------------------------------------------
+
+    def check(self, word, pos):
+        """[(kind, detail)] for one word, in the order the app lists them."""
+        word = (word or '').strip()
+        if not word:
+            return []
+        problems = []
+        check = word if self.case_sensitive else word.lower()
+
+        if self._banned_re is not None and self._banned_re.search(check):
+            problems.extend(('banned_seq', seq) for seq, seq_check in self.banned if seq_check in check)
+
+        if self._allowed_re is not None and not self._allowed_re.search(word):
+            problems.append(('invalid_char', self.allowed))
+
+        rules = self._edge_rules('start', pos)
+        if rules and not self._edge_ok(rules, word[0], word.startswith):
+            problems.append(('must_start', None))
+        rules = self._edge_rules('end', pos)
+        if rules and not self._edge_ok(rules, word[-1], word.endswith):
+            problems.append(('must_end', None))
+
+        if self._structure_re is not None:
+            pattern = self.cv_pattern(word)
+            if not self._structure_re.search(pattern):
+                problems.append(('structure_fail', pattern))
+        return problems
+
+    def duplicates(self, words):
+        """[(row, first row)] for every word already used by an earlier row."""
+        if self.allow_duplicates:
+            return []
+        seen = {}
+        found = []
+        for row, word in enumerate(words):
+            word = (word or '').strip()
+            if not word:
+                continue
+            key = word if self.case_sensitive else word.lower()
+            first = seen.setdefault(key, row)
+            if first != row:
+                found.append((row, first))
+        return found
+
+
+# -- worker side ------------------------------------------------------------
+
+_checker = None
+
+
+def _init_worker(constraints, phonology):
+    global _checker
+    _checker = ConstraintChecker(constraints, phonology)
+
+
+def _check_chunk(task):
+    start, words, parts_of_speech = task
+    check = _checker.check
+    return [(start + i, kind, detail)
+            for i, (word, pos) in enumerate(zip(words, parts_of_speech))
+            for kind, detail in check(word, pos)]
+
+
+# -- driver -----------------------------------------------------------------
+
+def validate_lexicon(lexicon, constraints, phonology=None, workers=None):
+    """Violations of every entry, ordered by row.
+
+    lexicon is anything with column(field): a project_file.Lexicon or a
+    project_snapshot.Snapshot.
+    """
+    words = list(lexicon.column('word'))
+    parts_of_speech = list(lexicon.column('pos'))
+    ids = lexicon.column('id')
+    tasks = [(start, words[start:start + CHUNK_ROWS], parts_of_speech[start:start + CHUNK_ROWS])
+             for start in range(0, len(words), CHUNK_ROWS)]
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(constraints, phonology)) as pool:
+            chunks = list(pool.map(_check_chunk, tasks))
+    else:
+        _init_worker(constraints, phonology)
+        chunks = [_check_chunk(task) for task in tasks]
+
+    found = [problem for chunk in chunks for problem in chunk]
+    found.extend((row, 'duplicate', ids[first]) for row, first in ConstraintChecker(constraints).duplicates(words))
+    found.sort(key=lambda problem: problem[0])
+    return [Violation(row, ids[row], kind, detail) for row, kind, detail in found]
+
+
+def describe(violation, word, catalog):
+    """The message the app shows for a violation (English texts from en.json)."""
+    text = catalog.get(SOURCE_LOCALE, f'val.{violation.kind}', violation.kind)
+    if violation.kind == 'banned_seq':
+        return f'{text}: "{violation.detail}"'
+    if violation.kind == 'invalid_char':
+        return f'{text} ([{violation.detail}])'
+    if violation.kind == 'structure_fail':
+        return f'{text} ({violation.detail})'
+    if violation.kind == 'duplicate':
+        return f'{text} "{word}" (first: {violation.detail})'
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a project lexicon against its constraints.")
+    parser.add_argument('file', help="project JSON file")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"worker processes (default: CPU count, at most one per {CHUNK_ROWS} entries)")
+    parser.add_argument('--json', metavar='PATH', help="write the violations as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    project = load_project(args.file)
+    constraints = project.get('constraints')
+    checker = ConstraintChecker(constraints, project.get('phonology'))
+    for warning in checker.warnings:
+        print(f"Warning: {warning}", file=sys.stderr)
+    violations = validate_lexicon(project.lexicon, constraints, project.get('phonology'), args.workers)
+
+    if args.json:
+        data = json.dumps([v._asdict() for v in violations], ensure_ascii=False, indent=2)
+        if args.json == '-':
+            print(data)
+        else:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                f.write(data + '\n')
+        return
+
+    catalog = LocaleCatalog(codes=[SOURCE_LOCALE])
+    words = project.lexicon.column('word')
+    for v in violations:
+        print(f"{v.id} {words[v.row]!r}: {describe(v, words[v.row], catalog)}")
+    counts = Counter(v.kind for v in violations)
+    summary = ', '.join(f"{kind} {count}" for kind, count in counts.most_common()) or 'none'
+    print(f"{len(project.lexicon)} entries, {len({v.row for v in violations})} with violations ({summary})")
+
+
+if __name__ == "__main__":
+    main()
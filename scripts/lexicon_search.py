@@ -0,0 +1,309 @@
+"""
+Indexed search over project lexicons, scored like searchLexicon in
+src/services/searchService.ts.
+
+searchLexicon lower-cases and scans every entry on every query. LexiconIndex
+keeps indexes instead and only scores the entries they return:
+
+    word, ipa            trigram index over the lower-cased text, padded with
+                         start/end marks, so one- and two-letter queries and
+                         prefixes are answered from the same postings
+    definition,          inverted index of whitespace-separated tokens, plus
+    etymology            a trigram index over the token vocabulary to find
+                         the tokens containing the query
+    pos                  one set of entry ids per part of speech (the facet)
+
+Every candidate is checked against the real text before it is scored, so
+results are exactly those of searchLexicon: word EXACT 100 / START 50 /
+PARTIAL 20, ipa +15, definition +10 (DEFINITION when the word did not
+match), etymology +5, ordered by score, then word, then lexicon order.
+Entries are added, removed and updated one at a time, so an edit costs one
+entry, not a rebuild.
+
+    python scripts/lexicon_search.py resources/sindarin_complete.json galad
+    python scripts/lexicon_search.py big.json "ost" --pos Noun --fields word,ipa --limit 20
+
+Usage:
+    from lexicon_search import LexiconIndex
+
+    index = LexiconIndex.from_lexicon(project.lexicon)
+    for result in index.search('galad', pos='Noun'):
+        result.id, result.word, result.score, result.match_type
+    index.update({'id': 'sd0042', 'word': 'galadh', ...})
+"""
+import argparse
+import heapq
+import time
+import unicodedata
+from collections import namedtuple
+
+from project_file import load_project
+
+EXACT = 'EXACT'
+START = 'START'
+PARTIAL = 'PARTIAL'
+DEFINITION = 'DEFINITION'
+RELATED = 'RELATED'
+ALL = 'ALL'
+
+SEARCH_FIELDS = ('word', 'definition', 'etymology', 'ipa')
+# Marks around indexed text, so grams also record where a string starts and ends.
+_START = '\x02'
+_END = '\x03'
+
+SearchResult = namedtuple('SearchResult', 'id word score match_type')
+
+
+def _grams(text):
+    padded = _START + text + _END
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Map keys to the texts they were added with; find keys whose text contains a string."""
+
+    def __init__(self):
+        self.postings = {}  # gram -> set of keys
+        self._short = {}  # one- or two-character string -> grams containing it
+
+    def add(self, key, text):
+        for gram in _grams(text):
+            keys = self.postings.get(gram)
+            if keys is None:
+                keys = self.postings[gram] = set()
+                for part in {gram[i:i + n] for n in (1, 2) for i in range(4 - n)}:
+                    self._short.setdefault(part, set()).add(gram)
+            keys.add(key)
+
+    def remove(self, key, text):
+        for gram in _grams(text):
+            keys = self.postings.get(gram)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+                for part in {gram[i:i + n] for n in (1, 2) for i in range(4 - n)}:
+                    grams = self._short[part]
+                    grams.discard(gram)
+                    if not grams:
+                        del self._short[part]
+
+    def candidates(self, query):
+        """Keys whose text may contain query (a superset; callers verify)."""
+        if len(query) < 3:
+            found = set()
+            for gram in self._short.get(query, ()):
+                found |= self.postings[gram]
+            return found
+        postings = sorted((self.postings.get(query[i:i + 3], set()) for i in range(len(query) - 2)), key=len)
+        return postings[0].intersection(*postings[1:])
+
+
+class TokenIndex:
+    """Inverted index of whitespace-separated tokens, for long texts (definitions)."""
+
+    def __init__(self):
+        self.postings = {}  # token -> set of keys
+        self.vocabulary = TrigramIndex()
+
+    def add(self, key, text):
+        for token in set(text.split()):
+            keys = self.postings.get(token)
+            if keys is None:
+                keys = self.postings[token] = set()
+                self.vocabulary.add(token, token)
+            keys.add(key)
+
+    def remove(self, key, text):
+        for token in set(text.split()):
+            keys = self.postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[token]
+                self.vocabulary.remove(token, token)
+
+    def candidates(self, query):
+        """Keys whose text may contain query (a superset; callers verify)."""
+        # Any occurrence of query lies across whole tokens; its longest
+        # whitespace-free piece must lie inside a single token.
+        piece = max(query.split(), key=len, default='')
+        found = set()
+        for token in self.vocabulary.candidates(piece):
+            if piece in token:
+                found |= self.postings[token]
+        return found
+
+
+def collation_key(word):
+    """Approximates String.localeCompare: accents and case only break ties."""
+    folded = word.casefold()
+    base = ''.join(ch for ch in unicodedata.normalize('NFD', folded) if not unicodedata.combining(ch))
+    return base, folded, word
+
+
+class LexiconIndex:
+    """Search indexes over lexicon entries, keyed by entry id."""
+
+    def __init__(self, entries=()):
+        self.entries = {}  # id -> (word, ipa, pos, definition, etymology, position) as given
+        self._next_position = 0
+        self.words = TrigramIndex()
+        self.ipa = TrigramIndex()
+        self.definitions = TokenIndex()
+        self.etymologies = TokenIndex()
+        self.by_pos = {}  # pos -> set of ids
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def from_lexicon(cls, lexicon):
+        """Index a project_file.Lexicon (or snapshot) column by column."""
+        index = cls()
+        columns = [lexicon.column(field) for field in ('id', 'word', 'ipa', 'pos', 'definition', 'etymology')]
+        for entry_id, *fields in zip(*columns):
+            index._add(entry_id, *fields)
+        return index
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entry_id):
+        return entry_id in self.entries
+
+    # -- updates ------------------------------------------------------------
+
+    def add(self, entry):
+        """Index one LexiconEntry dict, replacing any entry with the same id."""
+        self._add(entry['id'], entry.get('word'), entry.get('ipa'), entry.get('pos'),
+                  entry.get('definition'), entry.get('etymology'))
+
+    def _add(self, entry_id, word, ipa, pos, definition, etymology):
+        # The position breaks ties like the lexicon order does; an edited entry keeps its place.
+        if entry_id in self.entries:
+            position = self.entries[entry_id][5]
+            self.remove(entry_id)
+        else:
+            position = self._next_position
+            self._next_position += 1
+        fields = (word or '', ipa or '', pos or '', definition or '', etymology or '', position)
+        self.entries[entry_id] = fields
+        self.words.add(entry_id, fields[0].lower())
+        self.ipa.add(entry_id, fields[1].lower())
+        self.by_pos.setdefault(fields[2], set()).add(entry_id)
+        self.definitions.add(entry_id, fields[3].lower())
+        self.etymologies.add(entry_id, fields[4].lower())
+
+    def remove(self, entry_id):
+        """Drop an entry from every index. Returns False if it was not indexed."""
+        fields = self.entries.pop(entry_id, None)
+        if fields is None:
+            return False
+        word, ipa, pos, definition, etymology, _ = fields
+        self.words.remove(entry_id, word.lower())
+        self.ipa.remove(entry_id, ipa.lower())
+        ids = self.by_pos[pos]
+        ids.discard(entry_id)
+        if not ids:
+            del self.by_pos[pos]
+        self.definitions.remove(entry_id, definition.lower())
+        self.etymologies.remove(entry_id, etymology.lower())
+        return True
+
+    update = add
+
+    # -- queries ------------------------------------------------------------
+
+    def search(self, query, pos=ALL, fields=SEARCH_FIELDS, limit=None):
+        """SearchResults ordered like searchLexicon; with limit, only the best ones."""
+        query = query.lower().strip()
+        if not query and pos == ALL:
+            return []
+        facet = None if pos == ALL else self.by_pos.get(pos, set())
+
+        if not query:
+            scored = [(1, PARTIAL, entry_id) for entry_id in facet]
+        else:
+            candidates = set()
+            if 'word' in fields:
+                candidates |= self.words.candidates(query)
+            if 'ipa' in fields:
+                candidates |= self.ipa.candidates(query)
+            if 'definition' in fields:
+                candidates |= self.definitions.candidates(query)
+            if 'etymology' in fields:
+                candidates |= self.etymologies.candidates(query)
+            if facet is not None:
+                candidates &= facet
+            scored = []
+            for entry_id in candidates:
+                score, match_type = self._score(self.entries[entry_id], query, fields)
+                if score > 0:
+                    scored.append((score, match_type, entry_id))
+
+        entries = self.entries
+
+        def order(item):
+            fields_of_entry = entries[item[2]]
+            return -item[0], collation_key(fields_of_entry[0]), fields_of_entry[5]
+
+        ranked = heapq.nsmallest(limit, scored, key=order) if limit is not None else sorted(scored, key=order)
+        return [SearchResult(entry_id, entries[entry_id][0], score, match_type)
+                for score, match_type, entry_id in ranked]
+
+    @staticmethod
+    def _score(fields_of_entry, query, fields):
+        word, ipa, _, definition, etymology, _ = fields_of_entry
+        score = 0
+        match_type = RELATED
+        if 'word' in fields:
+            word = word.lower()
+            if word == query:
+                score += 100
+                match_type = EXACT
+            elif word.startswith(query):
+                score += 50
+                match_type = START
+            elif query in word:
+                score += 20
+                match_type = PARTIAL
+        if 'ipa' in fields and query in ipa.lower():
+            score += 15
+        if 'definition' in fields and query in definition.lower():
+            score += 10
+            if score < 20:
+                match_type = DEFINITION
+        if 'etymology' in fields and query in etymology.lower():
+            score += 5
+        return score, match_type
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search a project lexicon through its indexes.")
+    parser.add_argument('file', help="project JSON file")
+    parser.add_argument('query')
+    parser.add_argument('--pos', default=ALL, help="only this part of speech")
+    parser.add_argument('--fields', default=','.join(SEARCH_FIELDS),
+                        help="comma-separated fields to match (default: all)")
+    parser.add_argument('--limit', type=int, default=20, help="results to print (default: 20)")
+    args = parser.parse_args()
+
+    project = load_project(args.file)
+    started = time.perf_counter()
+    index = LexiconIndex.from_lexicon(project.lexicon)
+    built = time.perf_counter() - started
+
+    fields = tuple(field.strip() for field in args.fields.split(','))
+    started = time.perf_counter()
+    results = index.search(args.query, args.pos, fields)
+    elapsed = time.perf_counter() - started
+    for result in results[:args.limit]:
+        print(f"{result.score:>4} {result.match_type:<10} {result.id:<12} {result.word}")
+    print(f"{len(results)} results of {len(index)} entries in {elapsed * 1000:.2f} ms "
+          f"(index built in {built:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
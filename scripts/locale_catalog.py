@@ -0,0 +1,230 @@
+"""
+Shared locale catalog for the Python i18n scripts.
+
+Loads every JSON file in src/locales once into memory (keys and values are
+interned, so the many strings repeated across 46+ locales are stored once),
+applies a batch of add/set/delete operations across all locales in a single
+pass and writes back only the files whose content actually changed, all
+together in one crash-safe transaction (see file_transaction.py).
+
+Usage:
+    from locale_catalog import LocaleCatalog, add, delete
+
+    catalog = LocaleCatalog()
+    catalog.apply([
+        add("grammar.bnfc", "Enter grammar syntax (BNF)..."),
+        delete("whats_new.f2_title"),
+    ])
+    catalog.flush()
+
+Keys are dotted paths ("grammar.bnfc") into the nested locale tree, resolved
+through a per-locale KeyIndex (see locale_keys.py).
+"""
+import json
+import os
+import sys
+from collections import namedtuple
+
+from file_transaction import FileTransaction, recover
+from locale_keys import KeyIndex
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPTS_DIR)
+LOCALES_DIR = os.path.join(ROOT_DIR, 'src', 'locales')
+SOURCE_LOCALE = 'en'
+
+ADD = 'add'
+SET = 'set'
+DELETE = 'delete'
+
+# value: a string applied to every targeted locale, or a dict mapping
+# locale code -> string (locales missing from the dict are left untouched).
+# locales: iterable of locale codes to restrict the operation to, or None.
+Operation = namedtuple('Operation', 'kind key value locales')
+
+
+def add(key, value, locales=None):
+    """Insert key only where it is missing."""
+    return Operation(ADD, key, value, locales)
+
+
+def set_value(key, value, locales=None):
+    """Insert or overwrite key."""
+    return Operation(SET, key, value, locales)
+
+
+def delete(key, locales=None):
+    """Remove key (and any section left empty by its removal)."""
+    return Operation(DELETE, key, None, locales)
+
+
+def intern_tree(node):
+    """Return a copy of a parsed locale tree with interned keys and values."""
+    if isinstance(node, dict):
+        return {sys.intern(k): intern_tree(v) for k, v in node.items()}
+    if isinstance(node, str):
+        return sys.intern(node)
+    return node
+
+
+def detect_format(raw):
+    """Return (indent, trailing_newline) as used by an existing locale file."""
+    indent = 2
+    for line in raw.split('\n')[1:]:
+        stripped = line.lstrip(' ')
+        if stripped:
+            indent = (len(line) - len(stripped)) or indent
+            break
+    return indent, raw.endswith('\n')
+
+
+def serialize(data, indent=2, trailing_newline=False):
+    text = json.dumps(data, ensure_ascii=False, indent=indent)
+    return text + '\n' if trailing_newline else text
+
+
+class LocaleFile:
+    __slots__ = ('code', 'path', 'data', 'raw', 'indent', 'trailing_newline', 'dirty', '_index')
+
+    def __init__(self, code, path, raw):
+        self.code = code
+        self.path = path
+        self.raw = raw
+        self.data = intern_tree(json.loads(raw))
+        self.indent, self.trailing_newline = detect_format(raw)
+        self.dirty = False
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = KeyIndex(self.data)
+        return self._index
+
+    def render(self):
+        return serialize(self.data, self.indent, self.trailing_newline)
+
+
+class LocaleCatalog:
+    """All locale files of the project, loaded once."""
+
+    def __init__(self, locales_dir=LOCALES_DIR, codes=None):
+        self.locales_dir = locales_dir
+        self.files = {}
+        self.load(codes)
+
+    def load(self, codes=None):
+        # Finish (or discard) a flush that was interrupted by a crash.
+        recover(directories=[self.locales_dir])
+        names = sorted(f for f in os.listdir(self.locales_dir) if f.endswith('.json'))
+        for filename in names:
+            code = filename[:-len('.json')]
+            if codes is not None and code not in codes:
+                continue
+            path = os.path.join(self.locales_dir, filename)
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = f.read()
+            try:
+                self.files[code] = LocaleFile(code, path, raw)
+            except ValueError as e:
+                raise ValueError(f"{filename}: invalid JSON: {e}") from e
+
+    @property
+    def codes(self):
+        return list(self.files)
+
+    def __contains__(self, code):
+        return code in self.files
+
+    def __getitem__(self, code):
+        return self.files[code].data
+
+    @property
+    def source(self):
+        return self[SOURCE_LOCALE]
+
+    # -- key access -------------------------------------------------------
+
+    def index(self, code):
+        """KeyIndex of one locale (dotted key -> nested location)."""
+        return self.files[code].index
+
+    def get(self, code, key, default=None):
+        return self.files[code].index.get(key, default)
+
+    def has(self, code, key):
+        return key in self.files[code].index
+
+    def set(self, code, key, value, overwrite=True):
+        """Set a dotted key in one locale. Returns True if the file changed."""
+        locale = self.files[code]
+        if not overwrite and key in locale.index:
+            return False
+        changed = locale.index.set(key, intern_tree(value))
+        locale.dirty |= changed
+        return changed
+
+    def delete(self, code, key):
+        """Remove a dotted key from one locale. Returns True if the file changed."""
+        locale = self.files[code]
+        changed = locale.index.delete(key)
+        locale.dirty |= changed
+        return changed
+
+    def normalize_keys(self):
+        """Fold legacy flat dotted entries into the nested tree of every locale."""
+        changes = {}
+        for code, locale in self.files.items():
+            count = locale.index.normalize()
+            if count:
+                locale.dirty = True
+                changes[code] = count
+        return changes
+
+    # -- batches ----------------------------------------------------------
+
+    def apply(self, operations):
+        """Apply operations to every locale in one pass.
+
+        Returns a dict mapping locale code -> number of keys changed.
+        """
+        operations = list(operations)
+        changes = {}
+        for code in self.files:
+            count = 0
+            for op in operations:
+                if op.locales is not None and code not in op.locales:
+                    continue
+                if op.kind == DELETE:
+                    count += self.delete(code, op.key)
+                    continue
+                value = op.value
+                if isinstance(value, dict):
+                    if code not in value:
+                        continue
+                    value = value[code]
+                count += self.set(code, op.key, value, overwrite=(op.kind == SET))
+            if count:
+                changes[code] = count
+        return changes
+
+    def flush(self):
+        """Write back locales whose serialized content changed. Returns their codes.
+
+        Either every changed file is replaced or, if staging fails, none is.
+        """
+        staged = {}
+        with FileTransaction() as tx:
+            for code, locale in self.files.items():
+                if not locale.dirty:
+                    continue
+                text = locale.render()
+                if text != locale.raw:
+                    tx.stage(locale.path, text)
+                    staged[code] = text
+        for code, locale in self.files.items():
+            if code in staged:
+                locale.raw = staged[code]
+            locale.dirty = False
+        return list(staged)
+
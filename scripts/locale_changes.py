@@ -0,0 +1,117 @@
+"""
+Change sets for en.json: which keys were added, changed or removed since the
+locales were last translated.
+
+The baseline is either the stored manifest (scripts/locale_manifest.json,
+one short hash of the English text per key, rewritten after every sync) or
+en.json as of any git revision:
+
+    python scripts/locale_changes.py                 # against the manifest
+    python scripts/locale_changes.py --since v1.1.0  # against a git revision
+    python scripts/locale_changes.py --init          # record en.json as translated
+
+Usage:
+    from locale_changes import diff, load_manifest
+
+    changes = diff(load_manifest(), catalog.index('en'))
+    changes.added, changes.changed, changes.removed
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+from collections import namedtuple
+
+from file_transaction import write_file
+from locale_catalog import LOCALES_DIR, ROOT_DIR, SOURCE_LOCALE, LocaleCatalog
+from locale_keys import KeyIndex
+
+MANIFEST_PATH = os.path.join(ROOT_DIR, 'scripts', 'locale_manifest.json')
+MANIFEST_VERSION = 1
+
+ChangeSet = namedtuple('ChangeSet', 'added changed removed')
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def snapshot(index):
+    """Map every key of a KeyIndex to the hash of its text."""
+    return {key: text_hash(value) for key, value in index.items() if isinstance(value, str)}
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Return the stored {key: hash} snapshot, or {} if there is none yet."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"{path}: unsupported manifest version {manifest.get('version')!r}")
+    return manifest['keys']
+
+
+def save_manifest(hashes, path=MANIFEST_PATH):
+    text = json.dumps({'version': MANIFEST_VERSION, 'source': SOURCE_LOCALE,
+                       'keys': dict(sorted(hashes.items()))}, ensure_ascii=False, indent=2)
+    write_file(path, text + '\n')
+
+
+def git_snapshot(revision, locales_dir=LOCALES_DIR):
+    """Return the {key: hash} snapshot of en.json at a git revision."""
+    path = os.path.relpath(os.path.join(locales_dir, f"{SOURCE_LOCALE}.json"), ROOT_DIR)
+    blob = f"{revision}:{path.replace(os.sep, '/')}"
+    try:
+        raw = subprocess.run(['git', 'show', blob], cwd=ROOT_DIR, check=True,
+                             capture_output=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Cannot read {blob}: {e.stderr.decode(errors='replace').strip()}") from None
+    return snapshot(KeyIndex(json.loads(raw.decode('utf-8'))))
+
+
+def diff(baseline, index):
+    """Compare a {key: hash} baseline with the current source KeyIndex."""
+    current = snapshot(index)
+    added = sorted(key for key in current if key not in baseline)
+    changed = sorted(key for key in current if key in baseline and baseline[key] != current[key])
+    removed = sorted(key for key in baseline if key not in current)
+    return ChangeSet(added, changed, removed)
+
+
+def baseline_from_args(args):
+    if args.since:
+        return git_snapshot(args.since)
+    return load_manifest(args.manifest)
+
+
+def add_baseline_arguments(parser):
+    parser.add_argument('--since', metavar='REV',
+                        help="compare against en.json at a git revision instead of the manifest")
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help="manifest of the last translated en.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show keys of en.json changed since the last translation.")
+    add_baseline_arguments(parser)
+    parser.add_argument('--init', action='store_true',
+                        help="record the current en.json as fully translated and exit")
+    args = parser.parse_args()
+
+    index = LocaleCatalog(codes=[SOURCE_LOCALE]).index(SOURCE_LOCALE)
+    if args.init:
+        save_manifest(snapshot(index), args.manifest)
+        print(f"Recorded {len(index)} keys in {args.manifest}")
+        return
+
+    changes = diff(baseline_from_args(args), index)
+    for label, keys in zip(('Added', 'Changed', 'Removed'), changes):
+        print(f"{label}: {len(keys)}")
+        for key in keys:
+            print(f"  {key}")
+
+
+if __name__ == "__main__":
+    main()
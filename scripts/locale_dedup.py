@@ -0,0 +1,122 @@
+"""
+Measure how much of each locale only repeats its fallbacks, and write sparse
+locale files that keep just the overrides.
+
+A value is redundant when it equals what i18next would show anyway if the
+key were missing: the value of the first locale in the fallback chain that
+has the key (see fallback_chain() in locale_registry.py; wuu and yue fall
+back to zh, then en, every other locale to en).
+
+    python scripts/locale_dedup.py                  # intern table + per-locale report
+    python scripts/locale_dedup.py --sparse         # -> public/locales/sparse/
+    python scripts/locale_dedup.py --sparse --out dist/sparse
+
+Sparse files are written next to a manifest.json that lists each locale's
+fallback chain, which the i18next fallbackLng setting must mirror.
+"""
+import argparse
+import json
+import os
+from collections import Counter, namedtuple
+
+import locale_registry
+from file_transaction import write_files
+from locale_catalog import LocaleCatalog, SOURCE_LOCALE
+from split_locales import OUT_DIR
+
+SPARSE_DIR = os.path.join(OUT_DIR, 'sparse')
+
+# copies_source: values equal to en.json; copies_parent: equal to a non-English fallback.
+LocaleStats = namedtuple('LocaleStats', 'code keys copies_source copies_parent overrides bytes sparse_bytes')
+
+
+def intern_table(catalog):
+    """Counter of every string value across all locales."""
+    table = Counter()
+    for code in catalog.codes:
+        table.update(value for _, value in catalog.index(code).items() if isinstance(value, str))
+    return table
+
+
+def inherited_value(catalog, code, key):
+    """(locale, value) i18next falls back to for key in code, or (None, None)."""
+    for parent in locale_registry.fallback_chain(code)[1:]:
+        if parent in catalog and catalog.has(parent, key):
+            return parent, catalog.get(parent, key)
+    return None, None
+
+
+def sparse_tree(catalog, code):
+    """Return (overrides tree, LocaleStats) for one locale."""
+    index = catalog.index(code)
+    tree = {}
+    copies_source = copies_parent = 0
+    for key, value in index.items():
+        parent, inherited = inherited_value(catalog, code, key)
+        if parent is not None and inherited == value:
+            if parent == SOURCE_LOCALE:
+                copies_source += 1
+            else:
+                copies_parent += 1
+            continue
+        node = tree
+        *sections, name = key.split('.')
+        for section in sections:
+            node = node.setdefault(section, {})
+        node[name] = value
+    keys = len(index)
+    full = len(_render(catalog[code]).encode('utf-8'))
+    sparse = len(_render(tree).encode('utf-8'))
+    stats = LocaleStats(code, keys, copies_source, copies_parent,
+                        keys - copies_source - copies_parent, full, sparse)
+    return tree, stats
+
+
+def _render(tree):
+    return json.dumps(tree, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_sparse(trees, out_dir=SPARSE_DIR):
+    contents = {os.path.join(out_dir, f"{code}.json"): _render(tree) for code, tree in trees.items()}
+    manifest = {code: {'file': f"{code}.json", 'fallback': list(locale_registry.fallback_chain(code)[1:])}
+                for code in trees}
+    contents[os.path.join(out_dir, 'manifest.json')] = json.dumps(manifest, indent=2) + '\n'
+    os.makedirs(out_dir, exist_ok=True)
+    write_files(contents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report fallback copies and write sparse locales.")
+    parser.add_argument('--sparse', action='store_true', help="write sparse locale files")
+    parser.add_argument('--out', default=SPARSE_DIR, help="directory for --sparse (default: public/locales/sparse)")
+    args = parser.parse_args()
+
+    catalog = LocaleCatalog()
+    catalog.normalize_keys()  # in memory only
+
+    table = intern_table(catalog)
+    total = sum(table.values())
+    print(f"Intern table: {len(table)} distinct strings for {total} values "
+          f"({100 * (1 - len(table) / total):.1f}% repeats)")
+
+    trees = {}
+    all_stats = []
+    for code in catalog.codes:
+        trees[code], stats = sparse_tree(catalog, code)
+        all_stats.append(stats)
+
+    print(f"{'locale':<8}{'keys':>6}{'=en':>6}{'=parent':>9}{'own':>6}{'KB':>8}{'sparse KB':>11}")
+    for s in sorted(all_stats, key=lambda s: s.overrides / (s.keys or 1)):
+        print(f"{s.code:<8}{s.keys:>6}{s.copies_source:>6}{s.copies_parent:>9}{s.overrides:>6}"
+              f"{s.bytes / 1024:>8.1f}{s.sparse_bytes / 1024:>11.1f}")
+    full = sum(s.bytes for s in all_stats)
+    sparse = sum(s.sparse_bytes for s in all_stats)
+    print(f"Total: {full / 1024:.0f} KB -> {sparse / 1024:.0f} KB sparse")
+
+    if args.sparse:
+        write_sparse(trees, args.out)
+        print(f"Wrote {len(trees)} sparse locales to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Dotted-key index over a nested locale tree.
+
+src/locales/*.json are nested ({"grammar": {"bnfc": "..."}}) while the
+scripts address strings with dotted keys ("grammar.bnfc"). KeyIndex maps
+every dotted key to the dict that holds it, so lookups, inserts and deletes
+are O(1) and never require flattening the whole tree again.
+
+Legacy flat entries (a literal "grammar.bnfc" key at the top level, as left
+behind by older scripts) are indexed under the same dotted key; a nested
+value always wins over a flat duplicate, as in scripts/normalize_locales.cjs.
+"""
+import sys
+
+
+class KeyIndex:
+    """Index of one locale tree. The tree is edited in place."""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._slots = {}      # dotted key -> (parent dict, leaf name)
+        self._sections = {'': tree}
+        self.legacy_keys = []  # flat dotted keys found at the top level
+        self._build(tree, '')
+        for key in self.legacy_keys:
+            self._slots.setdefault(key, (tree, key))
+
+    def _build(self, node, prefix):
+        for name, value in node.items():
+            if not prefix and '.' in name:
+                self.legacy_keys.append(name)
+                continue
+            key = prefix + name
+            if isinstance(value, dict):
+                self._sections[key] = value
+                self._build(value, key + '.')
+            else:
+                self._slots[key] = (node, name)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def keys(self):
+        return self._slots.keys()
+
+    def items(self):
+        for key, (parent, name) in self._slots.items():
+            yield key, parent[name]
+
+    def get(self, key, default=None):
+        slot = self._slots.get(key)
+        if slot is None:
+            return default
+        parent, name = slot
+        return parent[name]
+
+    def set(self, key, value):
+        """Insert or overwrite key. Returns True if the tree changed."""
+        slot = self._slots.get(key)
+        if slot is not None:
+            parent, name = slot
+            if parent is self.tree and '.' in name:
+                # Move a legacy flat entry into the nested tree.
+                del parent[name]
+                self.legacy_keys.remove(name)
+                del self._slots[key]
+                self.set(key, value)
+                return True
+            if parent[name] == value:
+                return False
+            parent[name] = value
+            return True
+        section, _, name = key.rpartition('.')
+        parent = self._section(section)
+        name = sys.intern(name)
+        if key in self._sections:
+            # A string replaces a whole section; its keys go with it.
+            self._forget_section(key)
+        parent[name] = value
+        self._slots[key] = (parent, name)
+        return True
+
+    def _forget_section(self, section):
+        node = self._sections.pop(section)
+        for name, value in node.items():
+            key = section + '.' + name
+            if isinstance(value, dict):
+                self._forget_section(key)
+            else:
+                self._slots.pop(key, None)
+
+    def delete(self, key):
+        """Remove key (and any legacy flat duplicate) and prune sections left empty.
+
+        Returns True if found.
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        parent, name = slot
+        del parent[name]
+        if key in self.legacy_keys:
+            self.legacy_keys.remove(key)
+            if parent is self.tree and name == key:
+                return True
+            # The nested value shadowed a flat duplicate; it goes too.
+            del self.tree[key]
+        section = key.rpartition('.')[0]
+        while section and not self._sections[section]:
+            del self._sections[section]
+            head, _, name = section.rpartition('.')
+            del self._sections[head][name]
+            section = head
+        return True
+
+    def _section(self, section):
+        node = self._sections.get(section)
+        if node is not None:
+            return node
+        head, _, name = section.rpartition('.')
+        parent = self._section(head)
+        if name in parent:
+            # A string sits where a section is needed; replace it.
+            self._slots.pop(section, None)
+        node = parent[sys.intern(name)] = {}
+        self._sections[section] = node
+        return node
+
+    def normalize(self):
+        """Fold legacy flat entries into the nested tree. Returns how many were removed."""
+        count = 0
+        for name in list(self.legacy_keys):
+            value = self.tree.pop(name)
+            self.legacy_keys.remove(name)
+            parent, leaf = self._slots[name]
+            if parent is self.tree and leaf == name:
+                del self._slots[name]
+                self.set(name, value)
+            count += 1
+        return count
+
+    def flat(self):
+        """Return a flat {dotted key: value} copy of the tree."""
+        return dict(self.items())
@@ -0,0 +1,126 @@
+"""
+Single registry of the locales shipped in src/locales.
+
+Every Python tool imports its locale list from here instead of keeping its
+own LANG_MAP / ALL_LOCALES copy. Each entry records:
+
+    code       locale file name without .json ("zh-tw")
+    backend    language code sent to translation backends ("zh-TW", "jw")
+    name       English name, for prompts and reports
+    direction  "ltr" or "rtl" (matches rtlLanguages in src/i18n.tsx)
+    plurals    CLDR plural categories i18next expects for the language
+    fallback   chain of locale codes used when a string is missing
+
+translation_targets() turns the registry into the minimal translation work
+set: locales whose backend language is the source language (pcm) are copied
+instead of translated, and locales sharing a backend language (zh, wuu, yue)
+are translated once.
+"""
+from collections import namedtuple
+
+from locale_catalog import SOURCE_LOCALE
+
+Locale = namedtuple('Locale', 'code backend name direction plurals fallback')
+
+ONE_OTHER = ('one', 'other')
+OTHER = ('other',)
+ONE_MANY_OTHER = ('one', 'many', 'other')
+ONE_FEW_OTHER = ('one', 'few', 'other')
+ONE_FEW_MANY_OTHER = ('one', 'few', 'many', 'other')
+
+_EN = (SOURCE_LOCALE,)
+
+LOCALES = [
+    Locale('ar', 'ar', 'Arabic', 'rtl', ('zero', 'one', 'two', 'few', 'many', 'other'), _EN),
+    Locale('bn', 'bn', 'Bengali', 'ltr', ONE_OTHER, _EN),
+    Locale('cs', 'cs', 'Czech', 'ltr', ONE_FEW_MANY_OTHER, _EN),
+    Locale('de', 'de', 'German', 'ltr', ONE_OTHER, _EN),
+    Locale('el', 'el', 'Greek', 'ltr', ONE_OTHER, _EN),
+    Locale('en', 'en', 'English', 'ltr', ONE_OTHER, ()),
+    Locale('es', 'es', 'Spanish', 'ltr', ONE_MANY_OTHER, _EN),
+    Locale('fa', 'fa', 'Persian', 'rtl', ONE_OTHER, _EN),
+    Locale('fi', 'fi', 'Finnish', 'ltr', ONE_OTHER, _EN),
+    Locale('fr', 'fr', 'French', 'ltr', ONE_MANY_OTHER, _EN),
+    Locale('gu', 'gu', 'Gujarati', 'ltr', ONE_OTHER, _EN),
+    Locale('ha', 'ha', 'Hausa', 'rtl', ONE_OTHER, _EN),
+    Locale('he', 'he', 'Hebrew', 'rtl', ('one', 'two', 'other'), _EN),
+    Locale('hi', 'hi', 'Hindi', 'ltr', ONE_OTHER, _EN),
+    Locale('hu', 'hu', 'Hungarian', 'ltr', ONE_OTHER, _EN),
+    Locale('id', 'id', 'Indonesian', 'ltr', OTHER, _EN),
+    Locale('it', 'it', 'Italian', 'ltr', ONE_MANY_OTHER, _EN),
+    Locale('ja', 'ja', 'Japanese', 'ltr', OTHER, _EN),
+    Locale('jv', 'jw', 'Javanese', 'ltr', OTHER, _EN),
+    Locale('km', 'km', 'Khmer', 'ltr', OTHER, _EN),
+    Locale('kn', 'kn', 'Kannada', 'ltr', ONE_OTHER, _EN),
+    Locale('ko', 'ko', 'Korean', 'ltr', OTHER, _EN),
+    Locale('ml', 'ml', 'Malayalam', 'ltr', ONE_OTHER, _EN),
+    Locale('mr', 'mr', 'Marathi', 'ltr', ONE_OTHER, _EN),
+    Locale('ms', 'ms', 'Malay', 'ltr', OTHER, _EN),
+    Locale('my', 'my', 'Burmese', 'ltr', OTHER, _EN),
+    Locale('nl', 'nl', 'Dutch', 'ltr', ONE_OTHER, _EN),
+    Locale('no', 'no', 'Norwegian', 'ltr', ONE_OTHER, _EN),
+    Locale('pa', 'pa', 'Punjabi', 'ltr', ONE_OTHER, _EN),
+    Locale('pcm', 'en', 'Nigerian Pidgin', 'ltr', OTHER, _EN),
+    Locale('pl', 'pl', 'Polish', 'ltr', ONE_FEW_MANY_OTHER, _EN),
+    Locale('pt', 'pt', 'Portuguese', 'ltr', ONE_MANY_OTHER, _EN),
+    Locale('ro', 'ro', 'Romanian', 'ltr', ONE_FEW_OTHER, _EN),
+    Locale('ru', 'ru', 'Russian', 'ltr', ONE_FEW_MANY_OTHER, _EN),
+    Locale('sr', 'sr', 'Serbian', 'ltr', ONE_FEW_OTHER, _EN),
+    Locale('sv', 'sv', 'Swedish', 'ltr', ONE_OTHER, _EN),
+    Locale('sw', 'sw', 'Swahili', 'ltr', ONE_OTHER, _EN),
+    Locale('ta', 'ta', 'Tamil', 'ltr', ONE_OTHER, _EN),
+    Locale('te', 'te', 'Telugu', 'ltr', ONE_OTHER, _EN),
+    Locale('th', 'th', 'Thai', 'ltr', OTHER, _EN),
+    Locale('tl', 'tl', 'Tagalog', 'ltr', ONE_OTHER, _EN),
+    Locale('tr', 'tr', 'Turkish', 'ltr', ONE_OTHER, _EN),
+    Locale('uk', 'uk', 'Ukrainian', 'ltr', ONE_FEW_MANY_OTHER, _EN),
+    Locale('ur', 'ur', 'Urdu', 'rtl', ONE_OTHER, _EN),
+    Locale('vi', 'vi', 'Vietnamese', 'ltr', OTHER, _EN),
+    Locale('wuu', 'zh', 'Wu Chinese', 'ltr', OTHER, ('zh', SOURCE_LOCALE)),
+    Locale('yue', 'zh', 'Cantonese', 'ltr', OTHER, ('zh', SOURCE_LOCALE)),
+    Locale('zh-tw', 'zh-TW', 'Traditional Chinese', 'ltr', OTHER, _EN),
+    Locale('zh', 'zh', 'Simplified Chinese', 'ltr', OTHER, _EN),
+]
+
+BY_CODE = {locale.code: locale for locale in LOCALES}
+CODES = [locale.code for locale in LOCALES]
+TARGET_CODES = [code for code in CODES if code != SOURCE_LOCALE]
+RTL_CODES = [locale.code for locale in LOCALES if locale.direction == 'rtl']
+
+
+def get(code):
+    return BY_CODE[code]
+
+
+def filename(code):
+    return f"{code}.json"
+
+
+def backend_code(code):
+    return BY_CODE[code].backend
+
+
+def fallback_chain(code):
+    """Locales consulted, in order, when code lacks a string (code itself first)."""
+    return (code,) + BY_CODE[code].fallback
+
+
+def translation_targets(codes=None, source=SOURCE_LOCALE):
+    """Compute the translation work set once.
+
+    Returns (groups, copies): groups maps a backend language code to the
+    locale codes that share it, in registry order; copies lists the locales
+    whose backend language is the source language, which just receive the
+    source text.
+    """
+    source_backend = BY_CODE[source].backend
+    groups = {}
+    copies = []
+    for locale in LOCALES:
+        if locale.code == source or (codes is not None and locale.code not in codes):
+            continue
+        if locale.backend == source_backend:
+            copies.append(locale.code)
+        else:
+            groups.setdefault(locale.backend, []).append(locale.code)
+    return groups, copies
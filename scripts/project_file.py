@@ -0,0 +1,297 @@
+"""
+Load and save KoreLang project files (ProjectData in src/types.ts) from Python.
+
+The lexicon is held column by column (Lexicon) instead of as one dict per
+entry. Every LexiconEntry field is a list with one string per row, and a
+per-row layout id records which fields the entry had and in what order. A
+lexicon of hundreds of thousands of entries therefore costs one pointer per
+field and row plus the strings themselves, and the repetitive columns (word,
+ipa, pos, etymology, derivedFrom) are interned so homonyms, parts of speech
+and empty etymologies are stored once.
+
+Files are read with json_stream, one lexicon entry at a time, and written
+back in the same schema. Top-level members this module does not know about
+(notes, currentView, ...) are kept in their original order. The same holds
+for extra or non-string entry fields.
+
+    python scripts/project_file.py resources/sindarin_complete.json
+    python scripts/project_file.py big.json --check     # save to a temp file and reload
+
+Usage:
+    from project_file import load_project, save_project
+
+    project = load_project('resources/sindarin_complete.json')
+    words = project.lexicon.column('word')
+    project.lexicon.append({'id': 'sd0101', 'word': 'mellon', 'ipa': 'ˈmɛlːɔn',
+                            'pos': 'Noun', 'definition': 'ami'})
+    save_project(project, 'sindarin.json')
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from array import array
+from collections import Counter
+
+from file_transaction import open_atomic
+from json_stream import CHUNK_SIZE, JsonReader, JsonStreamError
+
+# LexiconEntry fields (src/types.ts), in the order the app writes them.
+FIELDS = ('id', 'word', 'ipa', 'pos', 'definition', 'etymology', 'derivedFrom', 'notes')
+# Columns whose values repeat across entries; ids, definitions and notes are mostly unique.
+INTERNED_FIELDS = frozenset(('word', 'ipa', 'pos', 'etymology', 'derivedFrom'))
+
+
+class ProjectFileError(ValueError):
+    """The file is not a KoreLang project."""
+
+
+class Lexicon:
+    """Lexicon entries stored as columns.
+
+    column(field)[row] is the entry's string, or None where the entry lacks
+    the field. Non-string values and fields outside FIELDS are kept in a
+    sparse per-row table, so entry(row) always returns the entry as loaded.
+    """
+
+    __slots__ = ('_columns', '_layouts', '_layout_ids', '_rows', '_extras')
+
+    def __init__(self, entries=()):
+        self._columns = {field: [] for field in FIELDS}
+        self._layouts = []  # tuples of field names, in entry order
+        self._layout_ids = {}  # layout -> index in _layouts
+        self._rows = array('I')  # layout index of every row
+        self._extras = {}  # row -> {field: value} not held by a column
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, row):
+        return self.entry(row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.entry(row)
+
+    @property
+    def layouts(self):
+        """The distinct field orders, indexed by layout id."""
+        return self._layouts
+
+    @property
+    def layout_ids(self):
+        """array('I') holding the layout id of every row."""
+        return self._rows
+
+    @property
+    def extras(self):
+        """{row: {field: value}} for the values no column holds."""
+        return self._extras
+
+    @classmethod
+    def from_columns(cls, columns, layouts, layout_ids, extras=None):
+        """Rebuild a lexicon from its parts (see project_snapshot.py) without per-entry dicts."""
+        lexicon = cls()
+        rows = len(layout_ids)
+        for field in FIELDS:
+            values = list(columns[field]) if field in columns else [None] * rows
+            if field in INTERNED_FIELDS:
+                values = [value if value is None else sys.intern(value) for value in values]
+            lexicon._columns[field] = values
+        lexicon._layouts = [tuple(sys.intern(field) for field in layout) for layout in layouts]
+        lexicon._layout_ids = {layout: i for i, layout in enumerate(lexicon._layouts)}
+        lexicon._rows = array('I', layout_ids)
+        lexicon._extras = dict(extras or {})
+        return lexicon
+
+    def column(self, field):
+        """The live list of one field's values (None where absent). Do not modify it."""
+        return self._columns[field]
+
+    def entry(self, row):
+        """Rebuild one entry as a dict."""
+        row = range(len(self))[row]
+        extras = self._extras.get(row, ())
+        return {field: extras[field] if field in extras else self._columns[field][row]
+                for field in self._layouts[self._rows[row]]}
+
+    def append(self, entry):
+        """Add an entry (a LexiconEntry dict). Returns its row."""
+        row = len(self._rows)
+        for column in self._columns.values():
+            column.append(None)
+        self._rows.append(0)
+        self._store(row, entry)
+        return row
+
+    def replace(self, row, entry):
+        row = range(len(self))[row]
+        self._store(row, entry)
+
+    def set(self, row, field, value):
+        """Change one field of an entry."""
+        entry = self.entry(row)
+        entry[field] = value
+        self.replace(row, entry)
+
+    def remove(self, row):
+        """Delete an entry; later rows move up by one."""
+        row = range(len(self))[row]
+        for column in self._columns.values():
+            del column[row]
+        del self._rows[row]
+        self._extras = {r - (r > row): extras for r, extras in self._extras.items() if r != row}
+
+    def _store(self, row, entry):
+        if not isinstance(entry, dict):
+            raise ProjectFileError(f"lexicon entry {row} is not an object")
+        layout = tuple(entry)
+        layout_id = self._layout_ids.get(layout)
+        if layout_id is None:
+            layout_id = self._layout_ids[layout] = len(self._layouts)
+            self._layouts.append(tuple(sys.intern(field) for field in layout))
+        self._rows[row] = layout_id
+
+        extras = {}
+        for field, column in self._columns.items():
+            value = entry.get(field)
+            if isinstance(value, str):
+                column[row] = sys.intern(value) if field in INTERNED_FIELDS else value
+            else:
+                column[row] = None
+                if field in entry:
+                    extras[field] = value
+        for field in layout:
+            if field not in self._columns:
+                extras[field] = entry[field]
+        if extras:
+            self._extras[row] = extras
+        else:
+            self._extras.pop(row, None)
+
+
+class Project:
+    """A loaded project: the lexicon as a Lexicon, every other member as parsed.
+
+    members keeps the top-level members in file order; its 'lexicon' slot
+    only marks where the lexicon goes.
+    """
+
+    __slots__ = ('members', 'lexicon')
+
+    def __init__(self, members=None, lexicon=None):
+        self.members = members if members is not None else {}
+        self.lexicon = lexicon if lexicon is not None else Lexicon()
+
+    def __getitem__(self, name):
+        return self.lexicon if name == 'lexicon' else self.members[name]
+
+    def get(self, name, default=None):
+        if name == 'lexicon':
+            return self.lexicon
+        return self.members.get(name, default)
+
+    def to_dict(self):
+        """The whole project as plain JSON data (builds every entry)."""
+        data = {name: value for name, value in self.members.items()}
+        data['lexicon'] = list(self.lexicon)
+        return data
+
+
+def load_project(path, chunk_size=CHUNK_SIZE):
+    """Read a project file without ever holding more than one entry as a dict."""
+    members = {}
+    lexicon = Lexicon()
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = JsonReader(f, chunk_size)
+        try:
+            for name in reader.iter_object():
+                if name == 'lexicon':
+                    members[name] = None
+                    for _ in reader.iter_array():
+                        lexicon.append(reader.read_value())
+                else:
+                    members[name] = reader.read_value()
+        except JsonStreamError as e:
+            raise ProjectFileError(f"{path}: {e}") from e
+    return Project(members, lexicon)
+
+
+def _indented(value, depth):
+    return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n' + '  ' * depth)
+
+
+def dump_project(project, fp, one_entry_per_line=True):
+    """Write a project as JSON.
+
+    The layout is that of JSON.stringify(data, null, 2) (the app's export),
+    except that with one_entry_per_line each lexicon entry takes one line,
+    as in resources/sindarin_complete.json.
+    """
+    names = list(project.members)
+    if 'lexicon' not in project.members and len(project.lexicon):
+        names.append('lexicon')
+    fp.write('{')
+    for i, name in enumerate(names):
+        fp.write(',\n  ' if i else '\n  ')
+        fp.write(json.dumps(name, ensure_ascii=False) + ': ')
+        if name != 'lexicon':
+            fp.write(_indented(project.members[name], 1))
+            continue
+        lexicon = project.lexicon
+        if not len(lexicon):
+            fp.write('[]')
+            continue
+        fp.write('[')
+        for row in range(len(lexicon)):
+            fp.write(',\n    ' if row else '\n    ')
+            if one_entry_per_line:
+                fp.write(json.dumps(lexicon.entry(row), ensure_ascii=False))
+            else:
+                fp.write(_indented(lexicon.entry(row), 2))
+        fp.write('\n  ]')
+    fp.write('\n}\n' if names else '}\n')
+
+
+def save_project(project, path, one_entry_per_line=True):
+    """Write a project file atomically (see file_transaction.open_atomic)."""
+    with open_atomic(path) as f:
+        dump_project(project, f, one_entry_per_line)
+
+
+def _same_project(a, b):
+    if a.members != b.members or len(a.lexicon) != len(b.lexicon):
+        return False
+    return all(a.lexicon.entry(row) == b.lexicon.entry(row) for row in range(len(a.lexicon)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a KoreLang project file and summarize its lexicon.")
+    parser.add_argument('file')
+    parser.add_argument('--check', action='store_true', help="save to a temporary file, reload and compare")
+    args = parser.parse_args()
+
+    project = load_project(args.file)
+    lexicon = project.lexicon
+    print(f"{project.get('name', '?')} (version {project.get('version', '?')}): {len(lexicon)} entries")
+    for pos, count in Counter(lexicon.column('pos')).most_common():
+        print(f"  {pos}: {count}")
+
+    if args.check:
+        fd, tmp_path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            save_project(project, tmp_path)
+            ok = _same_project(project, load_project(tmp_path))
+        finally:
+            os.remove(tmp_path)
+        print("Round trip: OK" if ok else "Round trip: MISMATCH")
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Binary snapshots of KoreLang project files for batch jobs that only need a
+few lexicon fields.
+
+A snapshot (<project>.klsnap, next to the JSON file) is opened with mmap:
+opening reads the header only, and a column is read from disk when it is
+first touched, so scanning `word` over a huge lexicon neither parses the
+JSON nor loads the other fields.
+
+Layout (integers little-endian):
+
+    8 bytes   magic b'KLSNAP\\0\\0'
+    u32       format version
+    u32       header length, then the header as UTF-8 JSON:
+              {"schema", "rows", "source", "columns": {field: {"index", "table", "table_bytes"}},
+               "layouts", "layout_ids", "extras", "members", "lexicon_position"}
+    data      8-byte aligned sections; header offsets are relative to its start
+
+    column    index: u32 per row, offset of the value in the column's string
+                     table, or 0xFFFFFFFF where the entry lacks the field
+              table: each distinct value once, as u32 byte length + UTF-8
+    layout_ids  u32 per row (see Lexicon.layouts in project_file.py)
+    extras, members   UTF-8 JSON: non-column entry values and the top-level
+                      members other than the lexicon
+
+"source" records the size and mtime of the JSON file, so open_snapshot()
+rebuilds a snapshot that is out of date.
+
+    python scripts/project_snapshot.py public/sindarin_complete.json
+    python scripts/project_snapshot.py big.json --field word --limit 20
+
+Usage:
+    from project_snapshot import open_snapshot
+
+    with open_snapshot('big.json') as snapshot:
+        for word, ipa in zip(snapshot.column('word'), snapshot.column('ipa')):
+            ...
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from file_transaction import open_atomic
+from project_file import FIELDS, Lexicon, Project, load_project
+
+MAGIC = b'KLSNAP\0\0'
+FORMAT_VERSION = 1
+SUFFIX = '.klsnap'
+ABSENT = 0xFFFFFFFF
+_PREAMBLE = struct.Struct('<8sII')
+_LENGTH = struct.Struct('<I')
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot this version can read."""
+
+
+def snapshot_path(project_path):
+    return os.path.splitext(project_path)[0] + SUFFIX
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _u32_bytes(values):
+    values = array('I', values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _string_table(values):
+    """Return (index bytes, table bytes) for one column."""
+    offsets = {}
+    table = bytearray()
+    index = array('I')
+    for value in values:
+        if value is None:
+            index.append(ABSENT)
+            continue
+        offset = offsets.get(value)
+        if offset is None:
+            offset = offsets[value] = len(table)
+            data = value.encode('utf-8')
+            table += _LENGTH.pack(len(data))
+            table += data
+            if len(table) >= ABSENT:
+                raise SnapshotError("column string table exceeds 4 GiB")
+        index.append(offset)
+    return _u32_bytes(index), bytes(table)
+
+
+def write_snapshot(project, path, source=None):
+    """Write project (a project_file.Project) as a snapshot file."""
+    lexicon = project.lexicon
+    sections = []
+    position = 0
+
+    def section(data):
+        """Queue one aligned section; return [offset, length]."""
+        nonlocal position
+        offset = position
+        sections.append(data)
+        sections.append(b'\0' * (-len(data) % 8))
+        position += len(data) + len(sections[-1])
+        return [offset, len(data)]
+
+    columns = {}
+    for field in FIELDS:
+        values = lexicon.column(field)
+        if all(value is None for value in values):
+            continue
+        index, table = _string_table(values)
+        columns[field] = {'index': section(index)[0], 'table': section(table)[0], 'table_bytes': len(table)}
+    extras = {str(row): values for row, values in lexicon.extras.items()}
+    names = list(project.members)
+    members = {name: value for name, value in project.members.items() if name != 'lexicon'}
+    header = {
+        'schema': project.get('version'),
+        'rows': len(lexicon),
+        'source': source,
+        'columns': columns,
+        'layouts': [list(layout) for layout in lexicon.layouts],
+        'layout_ids': section(_u32_bytes(lexicon.layout_ids))[0],
+        'extras': section(json.dumps(extras, ensure_ascii=False).encode('utf-8')),
+        'members': section(json.dumps(members, ensure_ascii=False).encode('utf-8')),
+        # Where the lexicon sits among the top-level members.
+        'lexicon_position': names.index('lexicon') if 'lexicon' in names else None,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    preamble = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)) + header_bytes
+    preamble += b'\0' * (-len(preamble) % 8)
+
+    with open_atomic(path, binary=True) as f:
+        f.write(preamble)
+        for data in sections:
+            f.write(data)
+
+
+class Column:
+    """One lexicon field of a snapshot, decoded on access."""
+
+    __slots__ = ('_mm', '_index', '_table')
+
+    def __init__(self, mm, index, table):
+        self._mm = mm
+        self._index = index  # u32 offsets into the table, one per row
+        self._table = table  # absolute offset of the string table
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        offset = self._index[row]
+        if offset == ABSENT:
+            return None
+        start = self._table + offset
+        (length,) = _LENGTH.unpack_from(self._mm, start)
+        return self._mm[start + 4:start + 4 + length].decode('utf-8')
+
+    def __iter__(self):
+        mm = self._mm
+        table = self._table
+        unpack = _LENGTH.unpack_from
+        for offset in self._index:
+            if offset == ABSENT:
+                yield None
+                continue
+            start = table + offset
+            (length,) = unpack(mm, start)
+            yield mm[start + 4:start + 4 + length].decode('utf-8')
+
+
+class Snapshot:
+    """A snapshot file opened with mmap. Use as a context manager, or call close()."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"{path}: empty file") from None
+        self._views = []
+        try:
+            magic, version, header_length = _PREAMBLE.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise SnapshotError(f"{path}: not a project snapshot")
+            if version != FORMAT_VERSION:
+                raise SnapshotError(f"{path}: snapshot format {version}, expected {FORMAT_VERSION}")
+            start = _PREAMBLE.size
+            self.header = json.loads(self._mm[start:start + header_length].decode('utf-8'))
+        except (struct.error, ValueError) as e:
+            self.close()
+            if isinstance(e, SnapshotError):
+                raise
+            raise SnapshotError(f"{path}: corrupt header ({e})") from None
+        self._data = start + header_length + (-(start + header_length) % 8)
+        self._columns = {}
+        self._extras = None
+        self._layout_ids = None
+        self.layouts = [tuple(layout) for layout in self.header['layouts']]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.header['rows']
+
+    @property
+    def schema(self):
+        """The project's version string."""
+        return self.header['schema']
+
+    @property
+    def fields(self):
+        return [field for field in FIELDS if field in self.header['columns']]
+
+    def _u32_view(self, offset, count):
+        view = memoryview(self._mm)[self._data + offset:self._data + offset + 4 * count]
+        self._views.append(view)
+        if sys.byteorder == 'little':
+            view = view.cast('I')
+            self._views.append(view)
+            return view
+        values = array('I')
+        values.frombytes(view)
+        values.byteswap()
+        return values
+
+    def column(self, field):
+        """Lazy sequence of one field's values (None where absent)."""
+        column = self._columns.get(field)
+        if column is None:
+            if field not in FIELDS:
+                raise KeyError(field)
+            info = self.header['columns'].get(field)
+            if info is None:
+                index = [ABSENT] * len(self)
+                column = Column(self._mm, index, 0)
+            else:
+                column = Column(self._mm, self._u32_view(info['index'], len(self)), self._data + info['table'])
+            self._columns[field] = column
+        return column
+
+    def _json_section(self, name):
+        offset, length = self.header[name]
+        start = self._data + offset
+        return json.loads(self._mm[start:start + length].decode('utf-8'))
+
+    def layout_ids(self):
+        if self._layout_ids is None:
+            self._layout_ids = self._u32_view(self.header['layout_ids'], len(self))
+        return self._layout_ids
+
+    def extras(self):
+        """{row: {field: value}} for values no column holds."""
+        if self._extras is None:
+            self._extras = {int(row): values for row, values in self._json_section('extras').items()}
+        return self._extras
+
+    def entry(self, row):
+        """Rebuild one entry as a dict."""
+        row = range(len(self))[row]
+        extras = self.extras().get(row, ())
+        layout = self.layouts[self.layout_ids()[row]]
+        return {field: extras[field] if field in extras else self.column(field)[row] for field in layout}
+
+    def to_project(self):
+        """Load everything back into a project_file.Project."""
+        columns = {field: list(self.column(field)) for field in self.fields}
+        lexicon = Lexicon.from_columns(columns, self.layouts, self.layout_ids(), self.extras())
+        members = self._json_section('members')
+        position = self.header['lexicon_position']
+        if position is not None:
+            names = list(members)
+            names.insert(position, 'lexicon')
+            members = {name: members.get(name) for name in names}
+        return Project(members, lexicon)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._columns = {}
+        self._layout_ids = None
+        self._mm.close()
+        self._file.close()
+
+
+def build_snapshot(project_path, path=None):
+    """Snapshot a project JSON file. Returns the snapshot path."""
+    path = path or snapshot_path(project_path)
+    source = _source_stamp(project_path)
+    write_snapshot(load_project(project_path), path, source)
+    return path
+
+
+def open_snapshot(project_path, path=None, rebuild=True):
+    """Open the snapshot of a project file, (re)building it first if it is missing or stale."""
+    path = path or snapshot_path(project_path)
+    if rebuild:
+        try:
+            with Snapshot(path) as snapshot:
+                stale = snapshot.header.get('source') != _source_stamp(project_path)
+        except (OSError, SnapshotError):
+            stale = True
+        if stale:
+            build_snapshot(project_path, path)
+    return Snapshot(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mapped snapshot of a project file.")
+    parser.add_argument('file', help="project JSON file")
+    parser.add_argument('--out', help="snapshot path (default: next to the JSON file, .klsnap)")
+    parser.add_argument('--field', choices=FIELDS, help="print one lexicon column from the snapshot")
+    parser.add_argument('--limit', type=int, default=None, help="with --field, print at most this many values")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with open_snapshot(args.file, args.out) as snapshot:
+        elapsed = time.perf_counter() - started
+        if args.field:
+            column = snapshot.column(args.field)
+            for value in column[:args.limit]:
+                print(value if value is not None else '')
+            return
+        size = os.path.getsize(snapshot.path)
+        print(f"{snapshot.path}: {len(snapshot)} entries, schema {snapshot.schema}, "
+              f"{size / 1024:.0f} KB (ready in {elapsed:.2f}s)")
+        for field in snapshot.fields:
+            print(f"  {field}: {snapshot.header['columns'][field]['table_bytes'] / 1024:.0f} KB of distinct strings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Protect spans that must survive machine translation untouched.
+
+Before a string is sent to a backend, every protected span is replaced by a
+numbered marker ([[0]], [[1]], ...); after translation the markers are put
+back and checked. Protected spans are:
+
+    {{count}}           i18next interpolations (and %s, %d, {0} style slots)
+    v1.1.1              version strings (and identifiers like kernel_v1.1.1_stable)
+    KoreLang            product names
+    ˈkam.ra             IPA samples (any token containing IPA letters)
+    github.com/zRinexD  URLs and domains
+
+Usage:
+    masked, spans = protect("{{count}} words in KoreLang")
+    restore(translated_masked, spans)        # raises SpanError if a marker got lost
+
+    translate_batch = protect_batch(translate_batch, translate)
+"""
+import re
+
+PRODUCT_NAMES = ('KoreLang', 'Korelang', 'Gemini')
+
+_PATTERNS = [
+    r'\{\{[^{}]*\}\}',                                  # {{count}}
+    r'%(?:\d+\$)?[sd]|\{\d+\}',                         # %s, %1$d, {0}
+    r'\b(?:https?://)?[\w-]+(?:\.[\w-]+)*\.(?:com|org|net|io|dev)(?:/[^\s)]*)?',
+    r'(?<![\w.])v?\d+(?:\.\d+){1,3}(?:[-_][\w.]+)?(?![\w.])',  # v1.1.1, 1.2.0-beta
+    r'\b[A-Za-z]+_v\d+(?:\.\d+)+\w*',                    # kernel_v1.1.1_stable
+    r'\b(?:' + '|'.join(PRODUCT_NAMES) + r')\w*',
+    r'[^\s"\'(),;:]*[ɐ-˿βθχæðøœ][^\s"\'(),;:]*',  # IPA
+]
+PROTECTED_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _PATTERNS))
+
+MARKER = '[[{}]]'
+_MARKER_RE = re.compile(r'\[\[\s*(\d+)\s*\]\]')
+
+
+class SpanError(ValueError):
+    """A protected span did not survive translation."""
+
+
+def protect(text):
+    """Return (masked text, list of protected spans)."""
+    spans = []
+
+    def mask(match):
+        spans.append(match.group(0))
+        return MARKER.format(len(spans) - 1)
+
+    return PROTECTED_RE.sub(mask, text), spans
+
+
+def markers_intact(masked_source, masked_translation):
+    """True if the translation contains every marker of the source exactly once."""
+    expected = sorted(_MARKER_RE.findall(masked_source))
+    return sorted(_MARKER_RE.findall(masked_translation)) == expected
+
+
+def restore(masked, spans):
+    """Put protected spans back, raising SpanError if any marker is missing or duplicated."""
+    seen = []
+
+    def unmask(match):
+        index = int(match.group(1))
+        if index >= len(spans):
+            raise SpanError(f"unknown marker {match.group(0)!r}")
+        seen.append(index)
+        return spans[index]
+
+    text = _MARKER_RE.sub(unmask, masked)
+    if sorted(seen) != list(range(len(spans))):
+        lost = [spans[i] for i in range(len(spans)) if i not in seen]
+        raise SpanError(f"protected spans lost or duplicated: {lost or spans}")
+    return text
+
+
+def validate(source, translation):
+    """Return the protected spans of source that are missing from translation."""
+    _, spans = protect(source)
+    missing = []
+    for span in spans:
+        if translation.count(span) < source.count(span) and span not in missing:
+            missing.append(span)
+    return missing
+
+
+def protect_batch(translate_batch, translate=None):
+    """Wrap translate_batch(texts, lang) so protected spans round-trip.
+
+    Items whose markers do not come back are retried one by one through
+    translate(text, lang) when given; items that still fail keep their source
+    text and are recorded in the returned function's `failures` list as
+    (lang, source, error).
+    """
+    failures = []
+
+    def protected_translate_batch(texts, lang):
+        masked = [protect(text) for text in texts]
+        translated = translate_batch([m for m, _ in masked], lang)
+        results = []
+        for text, (masked_text, spans), translation in zip(texts, masked, translated):
+            try:
+                results.append(restore(translation, spans))
+                continue
+            except SpanError as e:
+                error = e
+            if translate is not None:
+                try:
+                    results.append(restore(translate(masked_text, lang), spans))
+                    continue
+                except SpanError as e:
+                    error = e
+            failures.append((lang, text, error))
+            results.append(text)
+        return results
+
+    protected_translate_batch.failures = failures
+    return protected_translate_batch
+
+
+def protect_single(translate):
+    """Wrap translate(text, lang) so protected spans round-trip (SpanError otherwise)."""
+    def protected_translate(text, lang):
+        masked, spans = protect(text)
+        return restore(translate(masked, lang), spans)
+    return protected_translate
@@ -0,0 +1,102 @@
+"""
+Single-pass multi-pattern rewriting for codemods.
+
+All (old, new) literal rules are compiled into one regular expression shaped
+like a trie, so each file is scanned once however many rules there are, and
+every position only follows the branches its next characters allow. At any
+position the longest matching rule wins, and replaced text is never
+rescanned, so one rule cannot clobber another rule's output.
+
+Rules match whole tokens: a rule starting (or ending) with a token character
+does not match when it is preceded (or followed) by another one. With the
+default token characters (letters, digits, _ and -), '--text-1' no longer
+matches inside '--text-10'.
+
+Usage:
+    rewriter = Rewriter([('--bg-main', '--background'), ('--text-1', '--text-primary')])
+    content = rewriter.rewrite(content)
+    rewriter.hits          # Counter: old literal -> replacements made so far
+"""
+import re
+from collections import Counter
+
+TOKEN_CHARS = r'\w-'
+
+
+def _trie_pattern(literals, is_token_char, end_boundary):
+    trie = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[None] = True
+
+    def build(node, last):
+        branches = [re.escape(ch) + build(child, ch) for ch, child in sorted(node.items(), key=_edge)
+                    if ch is not None]
+        if None in node:
+            # The end of a literal is the last choice, so longer rules win.
+            branches.append(end_boundary if is_token_char(last) else '')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie, None)
+
+
+def _edge(item):
+    return '' if item[0] is None else item[0]
+
+
+def compile_rules(literals, token_chars=TOKEN_CHARS):
+    """Compile literals into one pattern matching any of them as a whole token."""
+    if not token_chars:
+        return re.compile(_trie_pattern(literals, lambda ch: False, ''))
+    token_re = re.compile(f'[{token_chars}]')
+
+    def is_token_char(ch):
+        return ch is not None and token_re.match(ch) is not None
+
+    start_boundary = f'(?<![{token_chars}])'
+    end_boundary = f'(?![{token_chars}])'
+    # A literal's first character decides whether it needs the start boundary;
+    # the two groups never compete for the same position.
+    bounded = [literal for literal in literals if is_token_char(literal[0])]
+    free = [literal for literal in literals if not is_token_char(literal[0])]
+    parts = []
+    if bounded:
+        parts.append(start_boundary + _trie_pattern(bounded, is_token_char, end_boundary))
+    if free:
+        parts.append(_trie_pattern(free, is_token_char, end_boundary))
+    return re.compile('|'.join(parts) or r'(?!)')
+
+
+class Rewriter:
+    """Apply many literal replacements in one scan, counting hits per rule."""
+
+    def __init__(self, rules, token_chars=TOKEN_CHARS):
+        self.replacements = {}
+        for old, new in (rules.items() if isinstance(rules, dict) else rules):
+            if not old:
+                raise ValueError("Rewrite rules cannot match the empty string")
+            if self.replacements.get(old, new) != new:
+                raise ValueError(f"Conflicting rewrite rules for {old!r}")
+            self.replacements[old] = new
+        self.pattern = compile_rules(list(self.replacements), token_chars)
+        self.hits = Counter()
+
+    def rewrite(self, text):
+        """Return text with every rule applied, updating self.hits."""
+        hits = self.hits
+        replacements = self.replacements
+
+        def replace(match):
+            old = match.group(0)
+            hits[old] += 1
+            return replacements[old]
+
+        return self.pattern.sub(replace, text)
+
+    def report(self):
+        """Lines 'old -> new: hits' for every rule, in rule order."""
+        return [f"{old} -> {new}: {self.hits[old]}" for old, new in self.replacements.items()]
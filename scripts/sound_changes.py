@@ -0,0 +1,477 @@
+"""
+Deterministic sound changes for whole lexicons, in the notation of the
+Generate & Evolve view (SoundChangeRule.rule, e.g. "k > ʃ / _i").
+
+    target > replacement / environment // exception
+
+    target        literal text, a category (C, V), a set [ptk] or {ts,tʃ},
+                  or several targets separated by spaces or commas, each
+                  with its own replacement: "p t k > b d g"
+    replacement   text; empty, 0 or ∅ deletes the target. A set replaces a
+                  target set member by member: "[ptk] > [bdg]"
+    environment   where the change applies: _ stands for the target and #
+                  for a word boundary; (x) is optional. Several environments
+                  may be given, separated by commas: "k > ʃ / _i, _e"
+    exception     environments where the change does not apply
+
+C and V come from the project's phonology, with the same fallbacks as the
+Lexicon view (see lexicon_constraints.py): V is a vowel symbol or one of
+aeiouàáèéìíòóùú, C any other letter.
+
+Every rule is compiled once. A lookahead pattern finds each position where a
+target (and its right context) can start. The left context is matched
+backwards, against the reversed word, so it may have any length. A rule
+rewrites all its matches at once, left to right, looking only at the form it
+was given. Rules run in order.
+
+EvolutionCache keeps the form of every word after every rule. After an edit
+of rule N, only rules N onward run again. The cache is stored in
+.cache/sound_changes.json between runs.
+
+    python scripts/sound_changes.py project.json                    # the project's evolutionRules
+    python scripts/sound_changes.py project.json --rule "k > ʃ / _i" --rule "a > e / _#"
+    python scripts/sound_changes.py project.json --trace kina
+    python scripts/sound_changes.py project.json --out evolved.json
+
+Usage:
+    from sound_changes import Cascade, EvolutionCache
+
+    cascade = Cascade(["k > ʃ / _i", "V > ∅ / _#"], project.get('phonology'))
+    cascade.apply('kina')                          # 'ʃin'
+    forms = EvolutionCache().evolve(cascade, project.lexicon.column('word'))
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from file_transaction import write_file
+from lexicon_constraints import DEFAULT_VOWELS, phoneme_symbols
+from locale_catalog import ROOT_DIR
+from project_file import load_project, save_project
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.cache', 'sound_changes.json')
+CACHE_VERSION = 2
+
+_ARROW_RE = re.compile(r'\s*(?:->|→|>)\s*')
+_DELETED = ('', '0', '∅')
+
+
+class RuleError(ValueError):
+    """A sound change rule could not be parsed."""
+
+
+# -- rule notation ------------------------------------------------------------
+
+class _Set:
+    """One position matching any of several strings (and/or a single-character class)."""
+
+    __slots__ = ('strings', 'char_class')
+
+    def __init__(self, strings, char_class=None):
+        self.strings = sorted(set(strings), key=len, reverse=True)
+        self.char_class = char_class
+
+    def pattern(self, reverse):
+        options = [re.escape(s[::-1] if reverse else s) for s in self.strings]
+        if self.char_class:
+            options.append(self.char_class)
+        return options[0] if len(options) == 1 else '(?:' + '|'.join(options) + ')'
+
+
+class _Optional:
+    __slots__ = ('elements',)
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def pattern(self, reverse):
+        return '(?:' + _pattern(self.elements, reverse) + ')?'
+
+
+class _Boundary:
+    __slots__ = ()
+
+    def pattern(self, reverse):
+        # Reading right (or, reversed, left) from the target, # is where the word ends.
+        return r'\Z'
+
+
+BOUNDARY = _Boundary()
+
+
+def _max_length(elements):
+    """The longest text a sequence of elements can match."""
+    length = 0
+    for element in elements:
+        if isinstance(element, _Set):
+            length += max([len(s) for s in element.strings] + [1 if element.char_class else 0])
+        elif isinstance(element, _Optional):
+            length += _max_length(element.elements)
+    return length
+
+
+def _pattern(elements, reverse=False):
+    return ''.join(element.pattern(reverse) for element in (reversed(elements) if reverse else elements))
+
+
+def categories_from(phonology=None):
+    """{'C': ..., 'V': ...} for a project's phonology."""
+    phonology = phonology or {}
+    vowel_symbols = set(phoneme_symbols(phonology.get('vowels')))
+    vowel_letters = set(DEFAULT_VOWELS) | set(DEFAULT_VOWELS.upper())
+    single = ''.join(sorted({s for s in vowel_symbols if len(s) == 1} | vowel_letters))
+    return {
+        'V': _Set(vowel_symbols | vowel_letters),
+        'C': _Set(phoneme_symbols(phonology.get('consonants')), '[^\\s' + re.escape(single) + ']'),
+    }
+
+
+def _closing(text, start, opening, closing):
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == opening:
+            depth += 1
+        elif text[i] == closing:
+            depth -= 1
+            if depth == 0:
+                return i
+    raise RuleError(f"unclosed {opening!r} in {text!r}")
+
+
+def parse_elements(text, categories):
+    """Parse one side of an environment, or a target, into elements."""
+    elements = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+            continue
+        if ch == '#':
+            elements.append(BOUNDARY)
+        elif ch == '[':
+            end = _closing(text, i, '[', ']')
+            elements.append(_Set(text[i + 1:end]))
+            i = end
+        elif ch == '{':
+            end = _closing(text, i, '{', '}')
+            elements.append(_Set(s.strip() for s in text[i + 1:end].split(',') if s.strip()))
+            i = end
+        elif ch == '(':
+            end = _closing(text, i, '(', ')')
+            elements.append(_Optional(parse_elements(text[i + 1:end], categories)))
+            i = end
+        elif ch in categories:
+            elements.append(categories[ch])
+        else:
+            elements.append(_Set([ch]))
+        i += 1
+    return elements
+
+
+def _split_list(text, spaces=True):
+    """Split on commas (and spaces) outside [], {} and ()."""
+    items = []
+    current = []
+    depth = 0
+    for ch in text:
+        if ch in '[{(':
+            depth += 1
+        elif ch in ']})':
+            depth -= 1
+        if depth == 0 and (ch == ',' or spaces and ch.isspace()):
+            items.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    items.append(''.join(current))
+    return [item for item in items if item.strip()]
+
+
+def _set_members(text):
+    """Members of a text that is one whole [..] or {..} set, in order; otherwise None."""
+    text = text.strip()
+    if len(text) < 2 or (text[0], text[-1]) not in (('[', ']'), ('{', '}')):
+        return None
+    if _closing(text, 0, text[0], text[-1]) != len(text) - 1:
+        return None
+    if text[0] == '[':
+        return list(text[1:-1])
+    return [s.strip() for s in text[1:-1].split(',') if s.strip()]
+
+
+def _environments(text, categories):
+    """[(reversed left pattern or None, right pattern or None)] of a comma-separated list."""
+    environments = []
+    for part in _split_list(text, spaces=False):
+        if part.count('_') != 1:
+            raise RuleError(f"environment {part.strip()!r} needs exactly one _")
+        left, right = part.split('_')
+        left = parse_elements(left, categories)
+        right = parse_elements(right, categories)
+        environments.append((re.compile(_pattern(left, reverse=True)) if left else None,
+                             re.compile(_pattern(right)) if right else None))
+    return environments
+
+
+class SoundChange:
+    """One compiled rule. apply(word) returns the changed word (or word itself)."""
+
+    def __init__(self, source, categories=None):
+        self.source = source
+        categories = categories if categories is not None else categories_from()
+        text, _, exception = source.partition('//')
+        text, _, environment = text.partition('/')
+        parts = _ARROW_RE.split(text.strip(), maxsplit=1)
+        if len(parts) != 2 or not parts[0]:
+            raise RuleError(f"{source!r}: expected 'target > replacement / environment'")
+        targets = _split_list(parts[0])
+        replacements = _split_list(parts[1]) or ['']
+        if len(replacements) == 1:
+            replacements *= len(targets)
+        elif len(replacements) != len(targets):
+            raise RuleError(f"{source!r}: {len(targets)} targets but {len(replacements)} replacements")
+
+        pairs = []  # (target elements, replacement)
+        for target, replacement in zip(targets, replacements):
+            members = _set_members(replacement)
+            if members is None and any(ch in replacement for ch in '[]{}'):
+                raise RuleError(f"{source!r}: a set in the replacement must stand alone")
+            try:
+                elements = parse_elements(target, categories)
+            except RuleError as e:
+                raise RuleError(f"{source!r}: {e}") from None
+            if any(element is BOUNDARY for element in elements):
+                raise RuleError(f"{source!r}: # cannot be part of the target")
+            if members is None:
+                pairs.append((elements, replacement))
+                continue
+            # Member i of the target set becomes member i of the replacement set.
+            sources = _set_members(target)
+            if sources is None or len(sources) != len(members):
+                raise RuleError(f"{source!r}: the set {replacement.strip()} needs a target set of "
+                                f"{len(members)} members")
+            pairs.extend(([_Set([member])], replacement) for member, replacement in zip(sources, members))
+        # The scan takes the first alternative that matches: try longer targets first,
+        # so "t ts > d dz" can reach ts. Equal lengths keep the rule's order.
+        pairs.sort(key=lambda pair: -_max_length(pair[0]))
+        self.replacements = ['' if r in _DELETED else r for _, r in pairs]
+        alternatives = ['(' + _pattern(elements) + ')' for elements, _ in pairs]
+        # Zero-width, so every position is tried, including overlapping ones.
+        self._scan = re.compile('(?=' + '|'.join(alternatives) + ')')
+        self._target = re.compile('|'.join(alternatives))
+        try:
+            self.environments = _environments(environment, categories) if environment.strip() else []
+            self.exceptions = _environments(exception, categories) if exception.strip() else []
+        except RuleError as e:
+            raise RuleError(f"{source!r}: {e}") from None
+
+    def __repr__(self):
+        return f"SoundChange({self.source!r})"
+
+    @staticmethod
+    def _matches(environments, word, reversed_word, start, end):
+        for left, right in environments:
+            if right is not None and not right.match(word, end):
+                continue
+            if left is not None and not left.match(reversed_word, len(word) - start):
+                continue
+            return True
+        return False
+
+    def apply(self, word):
+        if not self._target.search(word):
+            return word
+        reversed_word = word[::-1]
+        pieces = []
+        last = 0
+        for match in self._scan.finditer(word):
+            start = match.start()
+            if start < last:
+                continue
+            group = match.lastindex
+            end = match.end(group)
+            if end == start:
+                continue
+            if self.environments and not self._matches(self.environments, word, reversed_word, start, end):
+                continue
+            if self.exceptions and self._matches(self.exceptions, word, reversed_word, start, end):
+                continue
+            pieces.append(word[last:start])
+            pieces.append(self.replacements[group - 1])
+            last = end
+        if not pieces:
+            return word
+        pieces.append(word[last:])
+        return ''.join(pieces)
+
+
+class Cascade:
+    """An ordered list of compiled rules."""
+
+    def __init__(self, rules, phonology=None):
+        categories = categories_from(phonology)
+        self.rules = [SoundChange(rule, categories) for rule in rules]
+        self.sources = [rule.source for rule in self.rules]
+        # Rules read C and V from the phonology, so it is part of the cascade's identity.
+        self.phonology_key = json.dumps(sorted(categories['V'].strings) + ['|'] + sorted(categories['C'].strings),
+                                        ensure_ascii=False)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def apply(self, word, start=0):
+        """Run rules start.. over word."""
+        for rule in self.rules[start:]:
+            word = rule.apply(word)
+        return word
+
+    def steps(self, word, start=0):
+        """The forms of word after each of rules start.."""
+        forms = []
+        for rule in self.rules[start:]:
+            word = rule.apply(word)
+            forms.append(word)
+        return forms
+
+
+# -- cache ------------------------------------------------------------------------
+
+class EvolutionCache:
+    """Forms of every word after every rule of the last cascade it ran."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.sources = []
+        self.phonology_key = None
+        self.forms = {}  # word -> [form after rule 1, form after rule 2, ...]
+        self.reused = 0  # rules taken from the cache by the last evolve()
+        if path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        self.sources = data['sources']
+        self.phonology_key = data['phonology']
+        for word, stored in data['words'].items():
+            # null stands for "unchanged by this rule".
+            forms = []
+            form = word
+            for value in stored:
+                form = form if value is None else value
+                forms.append(form)
+            self.forms[word] = forms
+
+    def save(self):
+        words = {}
+        for word, forms in self.forms.items():
+            stored = []
+            previous = word
+            for form in forms:
+                stored.append(None if form == previous else form)
+                previous = form
+            words[word] = stored
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_file(self.path, json.dumps({'version': CACHE_VERSION, 'sources': self.sources,
+                                          'phonology': self.phonology_key, 'words': words},
+                                         ensure_ascii=False, separators=(',', ':')))
+
+    def evolve(self, cascade, words):
+        """Final form of every word (None stays None), reusing the cached prefix of rules."""
+        keep = 0
+        if cascade.phonology_key == self.phonology_key:
+            for old, new in zip(self.sources, cascade.sources):
+                if old != new:
+                    break
+                keep += 1
+        self.reused = keep
+        cached = self.forms
+        forms = {}
+        results = []
+        for word in words:
+            if word is None:
+                results.append(None)
+                continue
+            steps = forms.get(word)
+            if steps is None:
+                previous = cached.get(word)
+                if previous is not None and keep:
+                    steps = previous[:keep]
+                    steps += cascade.steps(steps[-1], keep)
+                else:
+                    steps = cascade.steps(word)
+                forms[word] = steps
+            results.append(steps[-1] if steps else word)
+        self.forms = forms
+        self.sources = list(cascade.sources)
+        self.phonology_key = cascade.phonology_key
+        if self.path:
+            self.save()
+        return results
+
+
+# -- command line -----------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply sound changes to every word of a project.")
+    parser.add_argument('file', help="project JSON file")
+    parser.add_argument('--rule', action='append', help="rule to apply (repeatable; default: the project's evolutionRules)")
+    parser.add_argument('--field', choices=('word', 'ipa'), default='word', help="lexicon column to evolve")
+    parser.add_argument('--trace', metavar='WORD', help="show the form of WORD after every rule")
+    parser.add_argument('--out', help="save the evolved project here (etymology records the change)")
+    parser.add_argument('--limit', type=int, default=20, help="changed words to print (default: 20)")
+    parser.add_argument('--no-cache', action='store_true', help="do not read or write .cache/sound_changes.json")
+    args = parser.parse_args()
+
+    project = load_project(args.file)
+    rules = args.rule or [r['rule'] for r in project.get('evolutionRules') or [] if r.get('rule', '').strip()]
+    if not rules:
+        sys.exit("No sound changes: the project has no evolutionRules and no --rule was given.")
+    try:
+        cascade = Cascade(rules, project.get('phonology'))
+    except RuleError as e:
+        sys.exit(f"Invalid rule: {e}")
+
+    if args.trace:
+        form = args.trace
+        print(form)
+        for rule, step in zip(cascade.rules, cascade.steps(form)):
+            if step != form:
+                print(f"  {rule.source:<24} {step}")
+            form = step
+        return
+
+    lexicon = project.lexicon
+    column = lexicon.column(args.field)
+    cache = EvolutionCache(None if args.no_cache else CACHE_PATH)
+    started = time.perf_counter()
+    evolved = cache.evolve(cascade, column)
+    elapsed = time.perf_counter() - started
+
+    changed = [row for row, (old, new) in enumerate(zip(column, evolved)) if old != new]
+    for row in changed[:args.limit]:
+        print(f"{column[row]} > {evolved[row]}")
+    reused = f", rules 1-{cache.reused} from cache" if cache.reused else ''
+    print(f"{len(changed)} of {len(lexicon)} words changed by {len(cascade)} rules in {elapsed:.2f}s{reused}")
+
+    if args.out:
+        for row in changed:
+            entry = lexicon.entry(row)
+            entry[args.field] = evolved[row]
+            entry['etymology'] = f"{entry.get('etymology') or ''}; {column[row]} > {evolved[row]}".lstrip('; ')
+            lexicon.replace(row, entry)
+        save_project(project, args.out)
+        print(f"Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Split every locale into one JSON chunk per top-level namespace for lazy loading.
+
+    python scripts/split_locales.py                  # -> public/locales/
+    python scripts/split_locales.py --out dist/locales
+
+Output layout:
+
+    public/locales/manifest.json
+    public/locales/<code>/<namespace>.<hash>.json
+
+Chunk names carry a hash of their content, so they can be cached forever and
+an unchanged namespace keeps its file (and its browser cache entry) across
+builds. manifest.json maps locale -> namespace -> {file, hash, bytes, keys};
+a lazy loader looks a chunk up there before fetching it (src/i18n.tsx does
+not load chunks yet; it still bundles src/locales/*.json). Chunks no longer
+listed in the manifest are removed.
+
+Legacy flat dotted keys are folded into their namespace first, the same way
+normalize_locales.cjs does.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from file_transaction import write_files
+from locale_catalog import ROOT_DIR, LocaleCatalog
+
+OUT_DIR = os.path.join(ROOT_DIR, 'public', 'locales')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+# Chunk for top-level entries that are not namespaces.
+ROOT_NAMESPACE = '_root'
+
+
+def render_chunk(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def count_keys(node):
+    if isinstance(node, dict):
+        return sum(count_keys(value) for value in node.values())
+    return 1
+
+
+def namespaces_of(tree):
+    """Split a locale tree into {namespace: subtree}."""
+    chunks = {}
+    for name, value in tree.items():
+        if isinstance(value, dict):
+            chunks[name] = value
+        else:
+            chunks.setdefault(ROOT_NAMESPACE, {})[name] = value
+    return chunks
+
+
+def split_locales(out_dir=OUT_DIR, catalog=None):
+    """Write the chunks and manifest. Returns (manifest, files written, files removed)."""
+    catalog = catalog or LocaleCatalog()
+    catalog.normalize_keys()  # in memory only; the catalog is never flushed here
+
+    manifest = {'version': MANIFEST_VERSION, 'locales': {}}
+    contents = {}
+    for code in catalog.codes:
+        entries = manifest['locales'][code] = {}
+        for namespace, subtree in namespaces_of(catalog[code]).items():
+            text = render_chunk(subtree)
+            data = text.encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+            name = f"{code}/{namespace}.{digest}.json"
+            entries[namespace] = {'file': name, 'hash': digest, 'bytes': len(data),
+                                  'keys': count_keys(subtree)}
+            path = os.path.join(out_dir, *name.split('/'))
+            if not os.path.exists(path):
+                contents[path] = text
+
+    manifest['namespaces'] = sorted({ns for entries in manifest['locales'].values() for ns in entries})
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    contents[manifest_path] = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+
+    for path in contents:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_files(contents)
+
+    keep = {os.path.join(out_dir, *entry['file'].split('/'))
+            for entries in manifest['locales'].values() for entry in entries.values()}
+    removed = []
+    for code in manifest['locales']:
+        directory = os.path.join(out_dir, code)
+        # A locale with no chunks has no directory of its own.
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            if filename.endswith('.json') and path not in keep:
+                os.remove(path)
+                removed.append(path)
+    return manifest, len(contents) - 1, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split locales into per-namespace chunks.")
+    parser.add_argument('--out', default=OUT_DIR, help="output directory (default: public/locales)")
+    args = parser.parse_args()
+
+    manifest, written, removed = split_locales(args.out)
+    locales = manifest['locales']
+    total = sum(entry['bytes'] for entries in locales.values() for entry in entries.values())
+    largest = max((entry['bytes'] for entries in locales.values() for entry in entries.values()), default=0)
+    print(f"{len(locales)} locales x {len(manifest['namespaces'])} namespaces: "
+          f"{written} chunks written, {len(removed)} stale chunks removed")
+    print(f"{total / 1024:.0f} KB in total, largest chunk {largest / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Bring every locale up to date with en.json by translating only what changed.
+
+Keys added to or changed in en.json since the baseline (see locale_changes.py)
+are translated into all target locales; keys removed from en.json are
+deleted everywhere. The manifest is then updated, leaving out keys whose
+translation failed so the next run retries them.
+
+Usage:
+    python scripts/sync_locales.py --backend pseudo
+    python scripts/sync_locales.py --since v1.1.0 --dry-run
+"""
+import argparse
+
+import locale_registry
+from locale_catalog import LocaleCatalog, SOURCE_LOCALE
+from locale_changes import add_baseline_arguments, baseline_from_args, diff, save_manifest, snapshot
+from translation_backends import add_backend_arguments, backend_from_args, build_translators
+from translation_memory import TranslationMemory
+from translation_pipeline import TranslationJob, TranslationPipeline
+
+
+def sync_locales(baseline, backend, memory=None, workers=8, requests_per_second=None,
+                 dry_run=False, manifest=None):
+    """Apply the en.json change set to every locale. Returns the ChangeSet."""
+    catalog = LocaleCatalog()
+    source_index = catalog.index(SOURCE_LOCALE)
+    changes = diff(baseline, source_index)
+    keys = changes.added + changes.changed
+    print(f"{len(changes.added)} added, {len(changes.changed)} changed, "
+          f"{len(changes.removed)} removed since the last sync")
+
+    for key in changes.removed:
+        for code in catalog.codes:
+            catalog.delete(code, key)
+
+    groups, copies = locale_registry.translation_targets(catalog.codes)
+    for code in copies:
+        for key in keys:
+            catalog.set(code, key, source_index.get(key))
+
+    jobs = [TranslationJob(lang_code, key, source_index.get(key), lang_code)
+            for lang_code in groups for key in keys]
+
+    translate, translate_batch = build_translators(backend, memory)
+    if requests_per_second is None:
+        requests_per_second = backend.requests_per_second
+    pipeline = TranslationPipeline(translate, workers=workers, requests_per_second=requests_per_second,
+                                   backend=backend.name, translate_batch=translate_batch,
+                                   max_chars=backend.max_chars)
+
+    def failed_keys(lang_code=None):
+        # Strings whose protected spans could not be restored kept their English text.
+        texts = {text for lang, text, _ in translate_batch.failures if lang_code in (None, lang)}
+        failed = {failure.job.key for failure in pipeline.failures if lang_code in (None, failure.job.locale)}
+        failed.update(key for key in keys if source_index.get(key) in texts)
+        return failed
+
+    def save(lang_code, translations):
+        # A changed key that failed keeps its previous translation rather than English.
+        failed = failed_keys(lang_code)
+        for code in groups[lang_code]:
+            for key, translation in translations.items():
+                if key not in failed or not catalog.has(code, key):
+                    catalog.set(code, key, translation)
+
+    if jobs:
+        pipeline.run(jobs, on_locale_done=save)
+    for failure in pipeline.failures:
+        print(f"Error translating {failure.job.key} to {failure.job.lang}: {failure.error}")
+    for lang_code, text, error in translate_batch.failures:
+        print(f"Kept English for {lang_code}: {text!r} ({error})")
+    failed = failed_keys()
+
+    if dry_run:
+        for key in keys:
+            print(f"  {key}: {source_index.get(key)!r}")
+        return changes
+
+    for code in catalog.flush():
+        print(f"Updated {locale_registry.filename(code)}")
+
+    # Failed keys keep their old hash (or none), so they show up again next time.
+    hashes = snapshot(source_index)
+    for key in failed:
+        if key in baseline:
+            hashes[key] = baseline[key]
+        else:
+            del hashes[key]
+    if manifest is not None:
+        save_manifest(hashes, manifest)
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translate only the keys of en.json that changed.")
+    add_backend_arguments(parser)
+    add_baseline_arguments(parser)
+    parser.add_argument('--workers', type=int, default=8, help="concurrent requests")
+    parser.add_argument('--rps', type=float, default=None,
+                        help="max requests per second (default: the backend's own limit)")
+    parser.add_argument('--dry-run', action='store_true', help="translate but do not write any file")
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        sync_locales(baseline_from_args(args), backend_from_args(args), memory,
+                     workers=args.workers, requests_per_second=args.rps, dry_run=args.dry_run,
+                     manifest=args.manifest)
+        print(memory.summary())
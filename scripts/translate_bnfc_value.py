@@ -1,86 +1,42 @@
-import json
-import os
-from translate import Translator
+import argparse
 
-LANG_MAP = {
-    'ar.json': 'ar',
-    'bn.json': 'bn',
-    'cs.json': 'cs',
-    'de.json': 'de',
-    'el.json': 'el',
-    'es.json': 'es',
-    'fa.json': 'fa',
-    'fi.json': 'fi',
-    'fr.json': 'fr',
-    'gu.json': 'gu',
-    'ha.json': 'ha',
-    'he.json': 'he',
-    'hi.json': 'hi',
-    'hu.json': 'hu',
-    'id.json': 'id',
-    'it.json': 'it',
-    'ja.json': 'ja',
-    'jv.json': 'jw',
-    'kn.json': 'kn',
-    'ko.json': 'ko',
-    'ml.json': 'ml',
-    'mr.json': 'mr',
-    'ms.json': 'ms',
-    'nl.json': 'nl',
-    'pa.json': 'pa',
-    'pcm.json': 'en', 
-    'pl.json': 'pl',
-    'pt.json': 'pt',
-    'ro.json': 'ro',
-    'ru.json': 'ru',
-    'sr.json': 'sr',
-    'sv.json': 'sv',
-    'sw.json': 'sw',
-    'ta.json': 'ta',
-    'te.json': 'te',
-    'th.json': 'th',
-    'tl.json': 'tl',
-    'tr.json': 'tr',
-    'uk.json': 'uk',
-    'ur.json': 'ur',
-    'vi.json': 'vi',
-    'wuu.json': 'zh',
-    'yue.json': 'zh',
-    'zh-tw.json': 'zh-TW',
-    'zh.json': 'zh'
-}
+import locale_registry
+from locale_catalog import LocaleCatalog
+from translation_backends import add_backend_arguments, backend_from_args, build_translators
+from translation_memory import TranslationMemory
 
-def translate_bnfc():
-    locales_dir = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
+def translate_bnfc(translate):
+    catalog = LocaleCatalog()
     source_text = "Enter grammar syntax (BNF)..."
-    
-    for filename, lang_code in LANG_MAP.items():
-        filepath = os.path.join(locales_dir, filename)
-        if not os.path.exists(filepath):
-            print(f"Skipping {filename}: Not found.")
-            continue
-            
-        print(f"Translating for {filename} ({lang_code})...")
-        
+    groups, copies = locale_registry.translation_targets(catalog.codes)
+
+    # For Nigerian Pidgin, we stay with English
+    work = [(lang_code, codes) for lang_code, codes in groups.items()]
+    work += [(locale_registry.backend_code(code), [code]) for code in copies]
+
+    for lang_code, codes in work:
+        print(f"Translating for {', '.join(codes)} ({lang_code})...")
+
         try:
-            # For Nigerian Pidgin, we stay with English
-            if lang_code == 'en' and filename != 'en.json':
+            if codes[0] in copies:
                 translation = source_text
             else:
-                translator = Translator(to_lang=lang_code)
-                translation = translator.translate(source_text)
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            data["grammar.bnfc"] = translation
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            print(f"Updated {filename} with: {translation}")
-            
+                translation = translate(source_text, lang_code)
+
+            for code in codes:
+                catalog.set(code, "grammar.bnfc", translation)
+                print(f"Updated {locale_registry.filename(code)} with: {translation}")
+            catalog.flush()
+
         except Exception as e:
-            print(f"Error updating {filename}: {e}")
+            print(f"Error updating {', '.join(codes)}: {e}")
 
 if __name__ == "__main__":
-    translate_bnfc()
+    parser = argparse.ArgumentParser()
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        translate, _ = build_translators(backend_from_args(args), memory)
+        translate_bnfc(translate)
+        print(memory.summary())
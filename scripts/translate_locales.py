@@ -1,91 +1,101 @@
+import argparse
 import os
-import json
-from translate import Translator
+import time
 
-# Map of filenames to language codes
-LANG_MAP = {
-    'ar.json': 'ar',
-    'bn.json': 'bn',
-    'cs.json': 'cs',
-    'de.json': 'de',
-    'el.json': 'el',
-    'es.json': 'es',
-    'fa.json': 'fa',
-    'fi.json': 'fi',
-    'fr.json': 'fr',
-    'gu.json': 'gu',
-    'ha.json': 'ha',
-    'he.json': 'he',
-    'hi.json': 'hi',
-    'hu.json': 'hu',
-    'id.json': 'id',
-    'it.json': 'it',
-    'ja.json': 'ja',
-    'jv.json': 'jw',
-    'kn.json': 'kn',
-    'ko.json': 'ko',
-    'ml.json': 'ml',
-    'mr.json': 'mr',
-    'ms.json': 'ms',
-    'nl.json': 'nl',
-    'pa.json': 'pa',
-    'pcm.json': 'en', # Nigerian Pidgin fallback
-    'pl.json': 'pl',
-    'pt.json': 'pt',
-    'ro.json': 'ro',
-    'ru.json': 'ru',
-    'sr.json': 'sr',
-    'sv.json': 'sv',
-    'sw.json': 'sw',
-    'ta.json': 'ta',
-    'te.json': 'te',
-    'th.json': 'th',
-    'tl.json': 'tl',
-    'tr.json': 'tr',
-    'uk.json': 'uk',
-    'ur.json': 'ur',
-    'vi.json': 'vi',
-    'wuu.json': 'zh',
-    'yue.json': 'zh',
-    'zh-tw.json': 'zh-TW',
-    'zh.json': 'zh'
-}
+import locale_registry
+from file_transaction import ProgressJournal
+from locale_catalog import ROOT_DIR, LocaleCatalog, SOURCE_LOCALE
+from locale_changes import text_hash
+from translation_backends import add_backend_arguments, backend_from_args, build_translators
+from translation_memory import TranslationMemory
+from translation_pipeline import TranslationJob, TranslationPipeline
 
-def translate_locales(base_dir):
+# Backend languages already saved by an interrupted run over the same en.json.
+PROGRESS_PATH = os.path.join(ROOT_DIR, '.cache', 'translate_locales.progress.json')
+
+def translate_locales(base_dir, backend, memory=None, workers=8, requests_per_second=None,
+                      batch=True, max_chars=None, dry_run=False, resume=True):
     source_file = os.path.join(base_dir, 'en.json')
-    
+
     if not os.path.exists(source_file):
         print(f"Source file {source_file} not found.")
         return
 
-    with open(source_file, 'r', encoding='utf-8') as f:
-        source_data = json.load(f)
+    catalog = LocaleCatalog(base_dir)
+    source_index = catalog.index(SOURCE_LOCALE)
+
+    # Locales sharing a backend language (zh, wuu, yue) are translated once;
+    # locales whose backend language is English (pcm) get the source text.
+    groups, copies = locale_registry.translation_targets(catalog.codes)
+    for code in copies:
+        for key, value in source_index.items():
+            catalog.set(code, key, value)
+        if not dry_run:
+            catalog.flush()
+            print(f"Copied {SOURCE_LOCALE}.json into {code}.json")
 
-    for filename, lang_code in LANG_MAP.items():
-        if filename == 'en.json':
+    fingerprint = text_hash('\n'.join([catalog.files[SOURCE_LOCALE].raw, backend.name, *catalog.codes]))
+    progress = ProgressJournal(PROGRESS_PATH, None if dry_run else fingerprint, resume=resume)
+    jobs = []
+    for lang_code, codes in groups.items():
+        if lang_code in progress:
+            print(f"Skipping {', '.join(codes)} ({lang_code}): saved by the interrupted run")
             continue
-            
-        target_path = os.path.join(base_dir, filename)
-        print(f"Processing {filename} ({lang_code})...")
-        
-        translator = Translator(to_lang=lang_code)
-        translated_data = {}
-        
-        for key, value in source_data.items():
-            try:
-                # Note: This is a basic implementation. For production use with many keys,
-                # consider batching or using a more robust API.
-                translation = translator.translate(value)
-                translated_data[key] = translation
-            except Exception as e:
-                print(f"Error translating {key} to {lang_code}: {e}")
-                translated_data[key] = value
-                
-        with open(target_path, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=4)
-        print(f"Saved {filename}")
+        print(f"Queueing {', '.join(codes)} ({lang_code})...")
+        jobs.extend(TranslationJob(lang_code, key, value, lang_code) for key, value in source_index.items())
+
+    def save(lang_code, translations):
+        for code in groups[lang_code]:
+            for key, translation in translations.items():
+                catalog.set(code, key, translation)
+        if not dry_run:
+            for code in catalog.flush():
+                print(f"Saved {code}.json")
+            # Strings that failed kept their English text: the next run retries this locale.
+            if not (any(failure.job.locale == lang_code for failure in pipeline.failures)
+                    or any(lang == lang_code for lang, _, _ in translate_batch.failures)):
+                progress.mark(lang_code)
+
+    translate, translate_batch = build_translators(backend, memory)
+    if requests_per_second is None:
+        requests_per_second = backend.requests_per_second
+    pipeline = TranslationPipeline(translate, workers=workers, requests_per_second=requests_per_second,
+                                   backend=backend.name, translate_batch=translate_batch if batch else None,
+                                   max_chars=max_chars or backend.max_chars)
+
+    started = time.perf_counter()
+    pipeline.run(jobs, on_locale_done=save)
+    elapsed = time.perf_counter() - started
+    span_failures = getattr(translate_batch, 'failures', ())
+    if not dry_run and not pipeline.failures and not span_failures:
+        progress.finish()
+
+    for failure in pipeline.failures:
+        job = failure.job
+        print(f"Error translating {job.key} to {job.lang}: {failure.error}")
+    for lang_code, text, error in span_failures:
+        print(f"Kept English for {lang_code}: {text!r} ({error})")
+    print(f"Translated {len(jobs)} strings with '{backend.name}' in {elapsed:.2f}s "
+          f"({len(jobs) / elapsed if elapsed else 0:.0f} strings/s)")
 
 if __name__ == "__main__":
     current_dir = os.path.dirname(os.path.abspath(__file__))
     locales_path = os.path.join(os.path.dirname(current_dir), 'src', 'locales')
-    translate_locales(locales_path)
+
+    parser = argparse.ArgumentParser(description="Machine-translate en.json into every locale.")
+    add_backend_arguments(parser)
+    parser.add_argument('--workers', type=int, default=8, help="concurrent requests")
+    parser.add_argument('--rps', type=float, default=None,
+                        help="max requests per second (default: the backend's own limit)")
+    parser.add_argument('--max-chars', type=int, default=None, help="max characters per batched request")
+    parser.add_argument('--no-batch', action='store_true', help="send one request per string")
+    parser.add_argument('--dry-run', action='store_true', help="translate but do not write locale files")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="retranslate every locale, even those saved by an interrupted run")
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        translate_locales(locales_path, backend_from_args(args), memory, workers=args.workers,
+                          requests_per_second=args.rps, batch=not args.no_batch,
+                          max_chars=args.max_chars, dry_run=args.dry_run, resume=not args.no_resume)
+        print(memory.summary())
@@ -1,54 +1,9 @@
-import json
-import os
-from translate import Translator
+import argparse
 
-LANG_MAP = {
-    'ar.json': 'ar',
-    'bn.json': 'bn',
-    'cs.json': 'cs',
-    'de.json': 'de',
-    'el.json': 'el',
-    'es.json': 'es',
-    'fa.json': 'fa',
-    'fi.json': 'fi',
-    'fr.json': 'fr',
-    'gu.json': 'gu',
-    'ha.json': 'ha',
-    'he.json': 'he',
-    'hi.json': 'hi',
-    'hu.json': 'hu',
-    'id.json': 'id',
-    'it.json': 'it',
-    'ja.json': 'ja',
-    'jv.json': 'jw',
-    'kn.json': 'kn',
-    'ko.json': 'ko',
-    'ml.json': 'ml',
-    'mr.json': 'mr',
-    'ms.json': 'ms',
-    'nl.json': 'nl',
-    'pa.json': 'pa',
-    'pcm.json': 'en',
-    'pl.json': 'pl',
-    'pt.json': 'pt',
-    'ro.json': 'ro',
-    'ru.json': 'ru',
-    'sr.json': 'sr',
-    'sv.json': 'sv',
-    'sw.json': 'sw',
-    'ta.json': 'ta',
-    'te.json': 'te',
-    'th.json': 'th',
-    'tl.json': 'tl',
-    'tr.json': 'tr',
-    'uk.json': 'uk',
-    'ur.json': 'ur',
-    'vi.json': 'vi',
-    'wuu.json': 'zh',
-    'yue.json': 'zh',
-    'zh-tw.json': 'zh-TW',
-    'zh.json': 'zh'
-}
+import locale_registry
+from locale_catalog import LocaleCatalog
+from translation_backends import add_backend_arguments, backend_from_args, build_translators
+from translation_memory import TranslationMemory
 
 NEW_KEYS = {
     "grammar.test_sentence": "the cat saw the dog",
@@ -61,46 +16,44 @@ NEW_KEYS = {
     "grammar.sandbox_desc": "Type a sentence to see how your grammar and morphology interact."
 }
 
-def translate_new_keys():
-    locales_dir = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
-    
-    for filename, lang_code in LANG_MAP.items():
-        filepath = os.path.join(locales_dir, filename)
-        if not os.path.exists(filepath):
-            print(f"Skipping {filename}: Not found.")
-            continue
-            
-        print(f"Processing {filename} ({lang_code})...")
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            translator = Translator(to_lang=lang_code)
-            
-            for key, source_text in NEW_KEYS.items():
-                # Handle placeholders for translation
-                text_to_translate = source_text.replace("{{count}}", "COUNT_PLACEHOLDER")
-                
-                if lang_code == 'en' and filename != 'en.json':
-                    translation = source_text
-                else:
-                    try:
-                        translation = translator.translate(text_to_translate)
-                        translation = translation.replace("COUNT_PLACEHOLDER", "{{count}}")
-                    except Exception as e:
-                        print(f"  Error translating {key}: {e}")
-                        translation = source_text
-                
-                data[key] = translation
-                print(f"  {key} -> {translation}")
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            print(f"Updated {filename}")
-            
-        except Exception as e:
-            print(f"Error updating {filename}: {e}")
+def translate_new_keys(translate_batch):
+    catalog = LocaleCatalog()
+    groups, copies = locale_registry.translation_targets(catalog.codes)
+    source_texts = list(NEW_KEYS.values())
+
+    # Locales sharing a backend language (zh, wuu, yue) are translated once
+    work = [(lang_code, codes) for lang_code, codes in groups.items()]
+    work += [(locale_registry.backend_code(code), [code]) for code in copies]
+
+    for lang_code, codes in work:
+        print(f"Processing {', '.join(codes)} ({lang_code})...")
+
+        if codes[0] in copies:
+            translations = source_texts
+        else:
+            # All keys go out in one batch; {{count}} is protected by the backend layer
+            try:
+                translations = translate_batch(source_texts, lang_code)
+            except Exception as e:
+                print(f"  Error translating: {e}")
+                translations = source_texts
+
+        for key, translation in zip(NEW_KEYS, translations):
+            for code in codes:
+                catalog.set(code, key, translation)
+            print(f"  {key} -> {translation}")
+
+        for code in catalog.flush():
+            print(f"Updated {locale_registry.filename(code)}")
 
 if __name__ == "__main__":
-    translate_new_keys()
+    parser = argparse.ArgumentParser()
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        _, translate_batch = build_translators(backend_from_args(args), memory)
+        translate_new_keys(translate_batch)
+        for lang_code, text, error in translate_batch.failures:
+            print(f"Kept English for {lang_code}: {text!r} ({error})")
+        print(memory.summary())
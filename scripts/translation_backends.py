@@ -0,0 +1,207 @@
+"""
+Pluggable machine-translation backends for the locale scripts.
+
+Backends register themselves by name and expose translate(text, lang) and
+translate_batch(texts, lang). Scripts pick one with --backend (or the
+KORELANG_TRANSLATION_BACKEND environment variable) instead of importing a
+translation library directly:
+
+    translate    MyMemory through the `translate` package (pip install translate)
+    pseudo       offline, deterministic pseudo-localization ("Save" -> "[fr Šàvé]")
+    dictionary   offline lookups in a JSON file {lang: {source: translation}}
+
+Backend options are passed as --backend-option key=value, for example
+--backend pseudo --backend-option latency=0.05 to simulate network latency
+when benchmarking the pipeline.
+"""
+import json
+import os
+import threading
+import time
+
+from protected_spans import markers_intact, protect_batch, protect_single
+from translation_batch import DEFAULT_MAX_CHARS, DEFAULT_MAX_ITEMS, make_batch_translate
+
+DEFAULT_BACKEND = os.environ.get('KORELANG_TRANSLATION_BACKEND', 'translate')
+
+_registry = {}
+
+
+def register_backend(name):
+    """Class decorator adding a backend to the registry."""
+    def decorator(cls):
+        cls.name = name
+        _registry[name] = cls
+        return cls
+    return decorator
+
+
+def available_backends():
+    return sorted(_registry)
+
+
+def get_backend(name=DEFAULT_BACKEND, **options):
+    try:
+        cls = _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown translation backend '{name}' "
+                         f"(available: {', '.join(available_backends())})") from None
+    return cls(**options)
+
+
+class TranslationBackend:
+    name = None
+    # Default request budget used by the pipeline (None = unlimited).
+    requests_per_second = None
+    # Worth storing in the translation memory (False for local, instant backends).
+    cacheable = True
+    max_chars = DEFAULT_MAX_CHARS
+    max_items = DEFAULT_MAX_ITEMS
+
+    def translate(self, text, lang):
+        raise NotImplementedError
+
+    def translate_batch(self, texts, lang):
+        """Translate several strings. Default: pack them into as few translate() calls as possible."""
+        batch = getattr(self, '_batch', None)
+        if batch is None:
+            batch = self._batch = make_batch_translate(self.translate, self.max_chars, self.max_items)
+        return batch(texts, lang)
+
+
+@register_backend('translate')
+class TranslateBackend(TranslationBackend):
+    """The `translate` package (MyMemory by default)."""
+
+    requests_per_second = 5
+
+    def __init__(self, provider=None, secret_access_key=None, email=None):
+        try:
+            from translate import Translator
+        except ImportError:
+            raise RuntimeError("The 'translate' backend needs the translate package: "
+                               "pip install translate") from None
+        self._translator_cls = Translator
+        self._options = {k: v for k, v in (('provider', provider),
+                                            ('secret_access_key', secret_access_key),
+                                            ('email', email)) if v}
+        self._translators = {}
+        self._lock = threading.Lock()
+
+    def _translator(self, lang):
+        with self._lock:
+            translator = self._translators.get(lang)
+            if translator is None:
+                translator = self._translators[lang] = self._translator_cls(to_lang=lang, **self._options)
+            return translator
+
+    def translate(self, text, lang):
+        return self._translator(lang).translate(text)
+
+
+_PSEUDO_MAP = str.maketrans(
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'àƀçđéƒĝĥîĵķĺɱñöþǫŕšţûṽŵẋýžÀƁÇĐÉƑĜĤÎĴĶĹṀÑÖÞǪŔŠŢÛṼŴẊÝŽ',
+)
+
+
+@register_backend('pseudo')
+class PseudoBackend(TranslationBackend):
+    """Offline pseudo-localization.
+
+    Accents ASCII letters and tags each line with the target language, leaving
+    {{placeholders}} untouched. Output is deterministic, so runs are
+    reproducible and diffable. `latency` (seconds per request) simulates a
+    remote service for throughput benchmarks.
+    """
+
+    cacheable = False
+
+    def __init__(self, latency=0):
+        self.latency = float(latency)
+
+    def translate(self, text, lang):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._pseudo(text, lang)
+
+    def translate_batch(self, texts, lang):
+        # One simulated round-trip for the whole batch.
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._pseudo(text, lang) for text in texts]
+
+    @classmethod
+    def _pseudo(cls, text, lang):
+        return '\n'.join(cls._line(line, lang) for line in text.split('\n'))
+
+    @staticmethod
+    def _line(line, lang):
+        if not line.strip():
+            return line
+        head, *parts = line.split('{{')
+        out = [head.translate(_PSEUDO_MAP)]
+        for part in parts:
+            name, sep, rest = part.partition('}}')
+            if sep:
+                out.append('{{' + name + '}}' + rest.translate(_PSEUDO_MAP))
+            else:
+                out.append('{{' + part.translate(_PSEUDO_MAP))
+        return f"[{lang} {''.join(out)}]"
+
+
+@register_backend('dictionary')
+class DictionaryBackend(TranslationBackend):
+    """Offline lookups in a JSON file shaped {lang: {source: translation}}.
+
+    Strings missing from the file are returned unchanged (or raise KeyError
+    with strict=true).
+    """
+
+    cacheable = False
+
+    def __init__(self, path, strict=False):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.entries = json.load(f)
+        self.strict = str(strict).lower() in ('1', 'true', 'yes')
+
+    def translate(self, text, lang):
+        table = self.entries.get(lang, {})
+        if text in table:
+            return table[text]
+        if self.strict:
+            raise KeyError(f"No {lang} translation for {text!r}")
+        return text
+
+    def translate_batch(self, texts, lang):
+        return [self.translate(text, lang) for text in texts]
+
+
+def add_backend_arguments(parser):
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=available_backends(),
+                        help=f"translation backend (default: {DEFAULT_BACKEND})")
+    parser.add_argument('--backend-option', action='append', default=[], metavar='KEY=VALUE',
+                        help="backend-specific option, may be repeated")
+
+
+def backend_from_args(args):
+    options = dict(option.split('=', 1) for option in args.backend_option)
+    return get_backend(args.backend, **options)
+
+
+def build_translators(backend, memory=None):
+    """Return (translate, translate_batch) for a backend.
+
+    Placeholders, versions, product names and IPA are masked before anything
+    is batched and checked on the way back (see protected_spans.py); the
+    translation memory, when the backend is worth caching, sits between the
+    masking and the backend and only remembers results whose markers survived.
+    translate_batch.failures lists strings that kept their source text because
+    a protected span could not be restored.
+    """
+    translate = backend.translate
+    translate_batch = backend.translate_batch
+    if memory is not None and backend.cacheable:
+        translate = memory.wrap(translate, backend=backend.name, validate=markers_intact)
+        translate_batch = memory.wrap_batch(translate_batch, backend=backend.name, validate=markers_intact)
+    return protect_single(translate), protect_batch(translate_batch, translate)
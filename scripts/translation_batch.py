@@ -0,0 +1,87 @@
+"""
+Batch translation: many source strings for one target language per request.
+
+Strings are packed one per line (embedded newlines are escaped first) into
+payloads of at most `max_chars` characters, sent as a single backend call and
+split back apart. If the backend merges or splits lines, so the line count no
+longer matches, the batch is bisected and retried until every piece
+round-trips, down to single strings.
+
+Usage:
+    translate_batch = make_batch_translate(translate, max_chars=500)
+    translate_batch(["Save", "Cancel"], "fr")   # -> ["Enregistrer", "Annuler"]
+"""
+import re
+
+SEPARATOR = '\n'
+# Embedded newlines are replaced by a token MT backends pass through untouched.
+NEWLINE_TOKEN = ' [[br]] '
+_NEWLINE_TOKEN_RE = re.compile(r'\s*\[\[br\]\]\s*')
+
+# MyMemory (the default `translate` provider) rejects queries over 500 chars.
+DEFAULT_MAX_CHARS = 500
+DEFAULT_MAX_ITEMS = 50
+
+
+class BatchMismatch(ValueError):
+    """The backend did not return one line per packed string."""
+
+
+def escape(text):
+    return text.replace('\r\n', '\n').replace('\n', NEWLINE_TOKEN)
+
+
+def pack(texts):
+    return SEPARATOR.join(escape(text) for text in texts)
+
+
+def unpack(payload, count):
+    lines = [line.strip() for line in payload.strip().split(SEPARATOR)]
+    lines = [line for line in lines if line]
+    if len(lines) != count:
+        raise BatchMismatch(f"expected {count} lines, got {len(lines)}")
+    return [_NEWLINE_TOKEN_RE.sub('\n', line) for line in lines]
+
+
+def chunk(texts, max_chars=DEFAULT_MAX_CHARS, max_items=DEFAULT_MAX_ITEMS):
+    """Split texts into consecutive groups whose packed size fits max_chars.
+
+    A single string longer than max_chars forms a group of its own.
+    Yields lists of indices into texts.
+    """
+    group = []
+    size = 0
+    for i, text in enumerate(texts):
+        length = len(escape(text)) + len(SEPARATOR)
+        if group and (size + length > max_chars or len(group) >= max_items):
+            yield group
+            group = []
+            size = 0
+        group.append(i)
+        size += length
+    if group:
+        yield group
+
+
+def make_batch_translate(translate, max_chars=DEFAULT_MAX_CHARS, max_items=DEFAULT_MAX_ITEMS):
+    """Build translate_batch(texts, lang) -> list from a translate(text, lang) primitive."""
+
+    def send(texts, lang):
+        if len(texts) == 1:
+            return [translate(texts[0], lang)]
+        try:
+            return unpack(translate(pack(texts), lang), len(texts))
+        except BatchMismatch:
+            middle = len(texts) // 2
+            return send(texts[:middle], lang) + send(texts[middle:], lang)
+
+    def translate_batch(texts, lang):
+        # Identical strings are sent once; blank strings are not sent at all.
+        unique = [text for text in dict.fromkeys(texts) if text.strip()]
+        translated = {text: text for text in texts if not text.strip()}
+        for group in chunk(unique, max_chars, max_items):
+            sources = [unique[i] for i in group]
+            translated.update(zip(sources, send(sources, lang)))
+        return [translated[text] for text in texts]
+
+    return translate_batch
@@ -0,0 +1,233 @@
+"""
+Persistent translation memory shared by the Python translation scripts.
+
+Every machine translation is stored in an SQLite database
+(.cache/translation_memory.sqlite3) keyed by (source text, target language),
+so re-running a script, or resuming one that was interrupted, only sends
+strings the backend has never seen.
+
+Usage:
+    with TranslationMemory() as memory:
+        translate = memory.wrap(backend_translate)   # translate(text, lang)
+        translate("Save", "fr")
+        translate_batch = memory.wrap_batch(backend_translate_batch)
+
+    python scripts/translation_memory.py --stats
+    python scripts/translation_memory.py --evict --max-entries 50000 --max-age-days 90
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+from locale_catalog import ROOT_DIR
+
+DEFAULT_PATH = os.path.join(ROOT_DIR, '.cache', 'translation_memory.sqlite3')
+DEFAULT_MAX_ENTRIES = 200000
+DEFAULT_MAX_AGE_DAYS = 365
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory (
+    lang TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    backend TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (lang, source)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class TranslationMemory:
+    """Exact-match translation store. Safe to share between pipeline threads."""
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._touched = set()
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, text, lang):
+        with self._lock:
+            row = self._db.execute(
+                'SELECT translation FROM memory WHERE lang = ? AND source = ?', (lang, text)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched.add((lang, text))
+            return row[0]
+
+    def put(self, text, lang, translation, backend=''):
+        self.put_many([(text, translation)], lang, backend)
+
+    def put_many(self, pairs, lang, backend=''):
+        """Store (source, translation) pairs for one language."""
+        now = time.time()
+        with self._lock:
+            # Committed immediately so an interrupted run keeps everything so far.
+            with self._db:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO memory (lang, source, translation, backend, created, last_used) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(lang, text, translation, backend, now, now) for text, translation in pairs],
+                )
+
+    def wrap(self, translate, backend='', validate=None):
+        """Return translate(text, lang) that consults the memory before `translate`.
+
+        When given, validate(source, translation) decides whether a fresh
+        translation is good enough to be remembered.
+        """
+        def cached_translate(text, lang):
+            translation = self.get(text, lang)
+            if translation is None:
+                translation = translate(text, lang)
+                if validate is None or validate(text, translation):
+                    self.put(text, lang, translation, backend)
+            return translation
+        return cached_translate
+
+    def wrap_batch(self, translate_batch, backend='', validate=None):
+        """Return translate_batch(texts, lang) that only sends memory misses."""
+        def cached_translate_batch(texts, lang):
+            results = [self.get(text, lang) for text in texts]
+            missing = [i for i, result in enumerate(results) if result is None]
+            if missing:
+                sources = [texts[i] for i in missing]
+                fresh = translate_batch(sources, lang)
+                for i, translation in zip(missing, fresh):
+                    results[i] = translation
+                self.put_many([(source, translation) for source, translation in zip(sources, fresh)
+                               if validate is None or validate(source, translation)], lang, backend)
+            return results
+        return cached_translate_batch
+
+    def evict(self, max_entries=None, max_age_days=None):
+        """Drop entries unused for max_age_days, then the least recently used
+        beyond max_entries. Returns the number of entries removed."""
+        with self._lock:
+            return self._evict(
+                self.max_entries if max_entries is None else max_entries,
+                self.max_age_days if max_age_days is None else max_age_days,
+            )
+
+    def _evict(self, max_entries, max_age_days):
+        self._flush_touched()
+        removed = 0
+        with self._db:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                removed += self._db.execute('DELETE FROM memory WHERE last_used < ?', (cutoff,)).rowcount
+            if max_entries is not None:
+                removed += self._evict_lru(max_entries)
+        return removed
+
+    def _evict_lru(self, max_entries):
+        count = self._db.execute('SELECT COUNT(*) FROM memory').fetchone()[0]
+        excess = count - max_entries
+        if excess <= 0:
+            return 0
+        return self._db.execute(
+            'DELETE FROM memory WHERE (lang, source) IN ('
+            '  SELECT lang, source FROM memory ORDER BY last_used ASC LIMIT ?)',
+            (excess,),
+        ).rowcount
+
+    def stats(self):
+        """Hit/miss counters for this session and since the memory was created."""
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM memory').fetchone()[0]
+            totals = dict(self._db.execute('SELECT name, value FROM counters').fetchall())
+        total_hits = totals.get('hits', 0) + self.hits
+        total_misses = totals.get('misses', 0) + self.misses
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': _rate(self.hits, self.misses),
+            'total_hits': total_hits,
+            'total_misses': total_misses,
+            'total_hit_rate': _rate(total_hits, total_misses),
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"Translation memory: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} entries")
+
+    def close(self):
+        """Persist counters, apply the configured limits and close the database."""
+        with self._lock:
+            self._evict(self.max_entries, self.max_age_days)
+            with self._db:
+                for name, value in (('hits', self.hits), ('misses', self.misses)):
+                    self._db.execute(
+                        'INSERT INTO counters (name, value) VALUES (?, ?) '
+                        'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                        (name, value),
+                    )
+            self.hits = self.misses = 0
+            self._db.close()
+
+    def _flush_touched(self):
+        if not self._touched:
+            return
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                'UPDATE memory SET last_used = ? WHERE lang = ? AND source = ?',
+                [(now, lang, text) for lang, text in self._touched],
+            )
+        self._touched.clear()
+
+
+def _rate(hits, misses):
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the translation memory.")
+    parser.add_argument('--path', default=DEFAULT_PATH)
+    parser.add_argument('--stats', action='store_true', help="print entry count and hit rate")
+    parser.add_argument('--evict', action='store_true', help="apply size and age limits")
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument('--max-age-days', type=float, default=DEFAULT_MAX_AGE_DAYS)
+    args = parser.parse_args()
+
+    with TranslationMemory(args.path, args.max_entries, args.max_age_days) as memory:
+        if args.evict:
+            print(f"Evicted {memory.evict()} entries")
+        if args.stats or not args.evict:
+            stats = memory.stats()
+            print(f"Entries: {stats['entries']}")
+            print(f"Hits: {stats['total_hits']}, misses: {stats['total_misses']}, "
+                  f"hit rate: {stats['total_hit_rate']:.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Concurrent machine-translation pipeline for the locale scripts.
+
+Fans translation jobs out over a bounded thread pool (translation backends
+are network bound, so threads are enough), throttles requests with a
+token-bucket rate limiter per backend, retries failures with exponential
+backoff and reassembles the results in the original job order.
+
+Usage:
+    pipeline = TranslationPipeline(translate, workers=8, requests_per_second=5)
+    results = pipeline.run(jobs, on_locale_done=lambda code, values: ...)
+
+`translate(text, lang)` is any callable returning the translated string.
+Pass `translate_batch(texts, lang)` (see translation_batch.py) to send the
+jobs of each locale in packed batches instead of one request per string;
+each batch then costs one rate-limiter token.
+"""
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from translation_batch import DEFAULT_MAX_CHARS, DEFAULT_MAX_ITEMS, chunk
+
+# locale: locale file code ("fr"), key: dotted key, text: source string,
+# lang: backend language code ("fr", "jw", "zh-TW").
+TranslationJob = namedtuple('TranslationJob', 'locale key text lang')
+TranslationFailure = namedtuple('TranslationFailure', 'job error')
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` calls per second, bursts up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter(backend, requests_per_second):
+    """Shared limiter for a backend, so every pipeline using it obeys one budget."""
+    if not requests_per_second:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(backend)
+        if limiter is None or limiter.rate != requests_per_second:
+            limiter = _limiters[backend] = RateLimiter(requests_per_second)
+        return limiter
+
+
+class TranslationPipeline:
+    def __init__(self, translate, workers=8, requests_per_second=None, retries=3,
+                 backoff=0.5, backend='default', translate_batch=None,
+                 max_chars=DEFAULT_MAX_CHARS, max_items=DEFAULT_MAX_ITEMS):
+        self.translate = translate
+        self.translate_batch = translate_batch
+        self.max_chars = max_chars
+        self.max_items = max_items
+        self.workers = max(1, workers)
+        self.limiter = rate_limiter(backend, requests_per_second)
+        self.retries = retries
+        self.backoff = backoff
+        self.failures = []
+
+    def _call(self, batch):
+        """Translate a list of jobs sharing one target language."""
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                if self.translate_batch is not None:
+                    return self.translate_batch([job.text for job in batch], batch[0].lang)
+                return [self.translate(job.text, job.lang) for job in batch]
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+                # Exponential backoff with jitter so workers do not retry in lockstep.
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+                attempt += 1
+
+    def run(self, jobs, on_locale_done=None):
+        """Translate jobs concurrently.
+
+        Returns {locale: {key: translation}} with keys in job order. A job that
+        still fails after all retries keeps its source text and is recorded in
+        self.failures. on_locale_done(locale, values) is called (from the
+        calling thread) as soon as every job of a locale has finished.
+        """
+        jobs = list(jobs)
+        slots = [None] * len(jobs)
+        positions = {}
+        for i, job in enumerate(jobs):
+            positions.setdefault(job.locale, []).append(i)
+        remaining = {locale: len(indices) for locale, indices in positions.items()}
+
+        def assemble(locale):
+            return {jobs[i].key: slots[i] for i in positions[locale]}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._call, [jobs[i] for i in batch]): batch
+                       for batch in self._batches(jobs, positions)}
+            for future in as_completed(futures):
+                batch = futures[future]
+                locale = jobs[batch[0]].locale
+                try:
+                    for i, translation in zip(batch, future.result()):
+                        slots[i] = translation
+                except Exception as e:
+                    for i in batch:
+                        self.failures.append(TranslationFailure(jobs[i], e))
+                        slots[i] = jobs[i].text
+                remaining[locale] -= len(batch)
+                if remaining[locale] == 0:
+                    results[locale] = assemble(locale)
+                    if on_locale_done is not None:
+                        on_locale_done(locale, results[locale])
+
+        return {locale: results[locale] for locale in positions}
+
+    def _batches(self, jobs, positions):
+        """Group job indices into requests: one per job, or packed per locale."""
+        for indices in positions.values():
+            if self.translate_batch is None:
+                for i in indices:
+                    yield [i]
+                continue
+            by_lang = {}
+            for i in indices:
+                by_lang.setdefault(jobs[i].lang, []).append(i)
+            for group in by_lang.values():
+                texts = [jobs[i].text for i in group]
+                for part in chunk(texts, self.max_chars, self.max_items):
+                    yield [group[j] for j in part]
@@ -1,18 +1,9 @@
-import json
-import os
-from translate import Translator
+import argparse
 
-LANG_MAP = {
-    'ar.json': 'ar', 'bn.json': 'bn', 'cs.json': 'cs', 'de.json': 'de', 'el.json': 'el',
-    'es.json': 'es', 'fa.json': 'fa', 'fi.json': 'fi', 'fr.json': 'fr', 'gu.json': 'gu',
-    'ha.json': 'ha', 'he.json': 'he', 'hi.json': 'hi', 'hu.json': 'hu', 'id.json': 'id',
-    'it.json': 'it', 'ja.json': 'ja', 'jv.json': 'jw', 'kn.json': 'kn', 'ko.json': 'ko',
-    'ml.json': 'ml', 'mr.json': 'mr', 'ms.json': 'ms', 'nl.json': 'nl', 'pa.json': 'pa',
-    'pcm.json': 'en', 'pl.json': 'pl', 'pt.json': 'pt', 'ro.json': 'ro', 'ru.json': 'ru',
-    'sr.json': 'sr', 'sv.json': 'sv', 'sw.json': 'sw', 'ta.json': 'ta', 'te.json': 'te',
-    'th.json': 'th', 'tl.json': 'tl', 'tr.json': 'tr', 'uk.json': 'uk', 'ur.json': 'ur',
-    'vi.json': 'vi', 'wuu.json': 'zh', 'yue.json': 'zh', 'zh-tw.json': 'zh-TW', 'zh.json': 'zh'
-}
+import locale_registry
+from locale_catalog import LocaleCatalog
+from translation_backends import add_backend_arguments, backend_from_args, build_translators
+from translation_memory import TranslationMemory
 
 UPDATES = {
     "whats_new.title": "What's new in v1.1.1",
@@ -21,47 +12,51 @@ UPDATES = {
     "console.kernel_version": "KoreLang kernel_v1.1.1_stable"
 }
 
-def update_locales():
-    locales_dir = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
-    
-    for filename, lang_code in LANG_MAP.items():
-        filepath = os.path.join(locales_dir, filename)
-        if not os.path.exists(filepath):
-            continue
-            
-        print(f"Updating {filename}...")
-        
+# Nigerian Pidgin (pcm) is not machine translated
+PIDGIN_UPDATES = {
+    "whats_new.title": "Wetin New for v1.1.1",
+    "whats_new.f1_title": "Beta Translations",
+    "whats_new.f1_desc": "All 46 languages now translate beta and dem work well everywhere.",
+    "console.kernel_version": "KoreLang kernel_v1.1.1_stable"
+}
+
+def update_locales(translate_batch):
+    catalog = LocaleCatalog()
+    groups, copies = locale_registry.translation_targets(catalog.codes)
+
+    for code in copies:
+        print(f"Updating {locale_registry.filename(code)}...")
+        for key, text in (PIDGIN_UPDATES if code == 'pcm' else UPDATES).items():
+            catalog.set(code, key, text)
+    catalog.flush()
+
+    # Locales sharing a backend language (zh, wuu, yue) are translated once
+    for lang_code, codes in groups.items():
+        print(f"Updating {', '.join(codes)}...")
+
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Handle Pidgin (pcm) separately by using English
-            if lang_code == 'en' and filename == 'pcm.json':
-                data["whats_new.title"] = "Wetin New for v1.1.1"
-                data["whats_new.f1_title"] = "Beta Translations"
-                data["whats_new.f1_desc"] = "All 46 languages now translate beta and dem work well everywhere."
-                data["console.kernel_version"] = "KoreLang kernel_v1.1.1_stable"
-            else:
-                translator = Translator(to_lang=lang_code)
-                for key, text in UPDATES.items():
-                    # For strings with versions, we might want to keep the version as is
-                    if "v1.1.1" in text:
-                        # Translate the part before the version if necessary
-                        if key == "whats_new.title":
-                            trans = translator.translate("What's new in")
-                            data[key] = f"{trans} v1.1.1"
-                        elif key == "console.kernel_version":
-                            data[key] = text # Keep kernel version standard
-                        else:
-                            data[key] = translator.translate(text)
-                    else:
-                        data[key] = translator.translate(text)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-                
+            # Version strings and "KoreLang" are protected by the backend layer
+            pending = {key: text for key, text in UPDATES.items() if key != "console.kernel_version"}
+            translations = translate_batch(list(pending.values()), lang_code)
+
+            for code in codes:
+                catalog.set(code, "console.kernel_version", UPDATES["console.kernel_version"]) # Keep kernel version standard
+                for key, trans in zip(pending, translations):
+                    catalog.set(code, key, trans)
+
+            catalog.flush()
+
         except Exception as e:
-            print(f"Error updating {filename}: {e}")
+            print(f"Error updating {', '.join(codes)}: {e}")
 
 if __name__ == "__main__":
-    update_locales()
+    parser = argparse.ArgumentParser()
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        _, translate_batch = build_translators(backend_from_args(args), memory)
+        update_locales(translate_batch)
+        for lang_code, text, error in translate_batch.failures:
+            print(f"Kept English for {lang_code}: {text!r} ({error})")
+        print(memory.summary())
@@ -1,53 +1,157 @@
-import json
+"""
+Check every locale in src/locales against en.json.
+
+    python scripts/verify_locales.py                 # full check
+    python scripts/verify_locales.py --incremental   # only re-check changed files
+
+In incremental mode a small cache (.cache/verify_locales.json) stores, per
+locale file, its size/mtime, a content hash and the issues found last time.
+Only files whose bytes changed are parsed again; a change to en.json or to
+the codes in locale_registry.py re-checks every locale. Exits with status 1
+when issues are found, so it can run as a pre-commit hook.
+"""
+import argparse
+import hashlib
 import os
+import sys
+
+import locale_registry
+from file_transaction import load_cache, save_cache
+from locale_catalog import LOCALES_DIR, ROOT_DIR, SOURCE_LOCALE, LocaleFile
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.cache', 'verify_locales.json')
+CACHE_VERSION = 1
+
+
+def check_locale(filename, index, en_index, en_keys):
+    """Return the consistency issues of one parsed locale."""
+    errors = []
+
+    if filename[:-len('.json')] not in locale_registry.BY_CODE:
+        errors.append(f"{filename}: Not listed in scripts/locale_registry.py")
+
+    if index.legacy_keys:
+        errors.append(f"{filename}: Flat dotted keys next to the nested tree: {set(index.legacy_keys)}")
+
+    if filename == f"{SOURCE_LOCALE}.json":
+        return errors
+
+    data_keys = set(index.keys())
+
+    missing_in_file = en_keys - data_keys
+    extra_in_file = data_keys - en_keys
+
+    if missing_in_file:
+        errors.append(f"{filename}: Missing keys: {missing_in_file}")
+    if extra_in_file:
+        errors.append(f"{filename}: Extra keys: {extra_in_file}")
+
+    # Check for empty values or untranslated placeholders
+    for k, v in index.items():
+        if not isinstance(v, str) or v.strip() == "":
+            errors.append(f"{filename}: Empty value for key '{k}'")
+        elif v == "..." or v == "?":
+            # Some values might legitimately be ... or ? if they were so in en.json
+            if en_index.get(k) != v:
+                errors.append(f"{filename}: Likely untranslated value '{v}' for key '{k}'")
+
+    return errors
+
+
+def cache_version():
+    """CACHE_VERSION plus the registered codes: the cached issues depend on both."""
+    codes = '\n'.join(sorted(locale_registry.BY_CODE))
+    return f"{CACHE_VERSION}:{hashlib.sha1(codes.encode('utf-8')).hexdigest()[:16]}"
 
-def verify_locales():
-    locales_dir = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
-    en_file = os.path.join(locales_dir, "en.json")
-    
-    with open(en_file, "r", encoding="utf-8") as f:
-        en_data = json.load(f)
-    
-    en_keys = set(en_data.keys())
-    print(f"Source file: en.json, Keys: {len(en_keys)}")
-    
-    files = [f for f in os.listdir(locales_dir) if f.endswith(".json") and f != "en.json"]
-    
+
+def fingerprint(path, cached):
+    """Return (size, mtime_ns, sha1, raw bytes or None).
+
+    When size and mtime match the cache the file is not even read.
+    """
+    st = os.stat(path)
+    if cached and cached.get('size') == st.st_size and cached.get('mtime_ns') == st.st_mtime_ns:
+        return st.st_size, st.st_mtime_ns, cached['hash'], None
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return st.st_size, st.st_mtime_ns, hashlib.sha1(raw).hexdigest(), raw
+
+
+def verify_locales(locales_dir=LOCALES_DIR, incremental=False, cache_path=CACHE_PATH):
+    """Return the list of issues found across all locales."""
+    cached = load_cache(cache_path, cache_version()) if incremental else {}
+    filenames = sorted(f for f in os.listdir(locales_dir) if f.endswith(".json"))
+    en_filename = f"{SOURCE_LOCALE}.json"
+
+    # Fingerprint everything first; en.json decides whether the rest is reusable.
+    prints = {}
+    for filename in filenames:
+        prints[filename] = fingerprint(os.path.join(locales_dir, filename), cached.get(filename))
+
+    source_changed = cached.get(en_filename, {}).get('hash') != prints[en_filename][2]
+    en_index = None
+    en_keys = None
+    entries = {}
     errors = []
-    for filename in files:
-        filepath = os.path.join(locales_dir, filename)
+    rechecked = 0
+
+    for filename in filenames:
+        size, mtime_ns, digest, raw = prints[filename]
+        previous = cached.get(filename)
+        if previous and previous['hash'] == digest and not source_changed:
+            entries[filename] = dict(previous, size=size, mtime_ns=mtime_ns)
+            errors.extend(previous['errors'])
+            continue
+
+        if en_index is None:
+            try:
+                en_index = _load(locales_dir, en_filename, prints[en_filename][3]).index
+            except (OSError, ValueError) as e:
+                # Nothing can be compared against an unreadable source.
+                return errors + [f"{en_filename}: Error reading file: {str(e)}"]
+            en_keys = set(en_index.keys())
+            print(f"Source file: {en_filename}, Keys: {len(en_keys)}")
+
+        rechecked += 1
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            data_keys = set(data.keys())
-            
-            missing_in_file = en_keys - data_keys
-            extra_in_file = data_keys - en_keys
-            
-            if missing_in_file:
-                errors.append(f"{filename}: Missing keys: {missing_in_file}")
-            if extra_in_file:
-                errors.append(f"{filename}: Extra keys: {extra_in_file}")
-            
-            # Check for empty values or untranslated placeholders
-            for k, v in data.items():
-                if not v or v.strip() == "":
-                    errors.append(f"{filename}: Empty value for key '{k}'")
-                if v == "..." or v == "?":
-                    # Some values might legitimately be ... or ? if they were so in en.json
-                    if en_data.get(k) != v:
-                        errors.append(f"{filename}: Likely untranslated value '{v}' for key '{k}'")
-
-        except Exception as e:
-            errors.append(f"{filename}: Error reading file: {str(e)}")
-            
+            locale = _load(locales_dir, filename, raw)
+            file_errors = check_locale(filename, locale.index, en_index, en_keys)
+        except (OSError, ValueError) as e:
+            file_errors = [f"{filename}: Error reading file: {str(e)}"]
+        entries[filename] = {'size': size, 'mtime_ns': mtime_ns, 'hash': digest, 'errors': file_errors}
+        errors.extend(file_errors)
+
+    if incremental:
+        print(f"Re-checked {rechecked} of {len(filenames)} locale files")
+        save_cache(cache_path, cache_version(), entries)
+
+    return errors
+
+
+def _load(locales_dir, filename, raw=None):
+    path = os.path.join(locales_dir, filename)
+    if raw is None:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    return LocaleFile(filename[:-len('.json')], path, raw.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every locale against en.json.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-check locale files changed since the last run")
+    parser.add_argument('--cache', default=CACHE_PATH, help="cache file for --incremental")
+    args = parser.parse_args()
+
+    errors = verify_locales(incremental=args.incremental, cache_path=args.cache)
+
     if not errors:
         print("All locale files are consistent with en.json!")
     else:
         print(f"Found {len(errors)} consistency issues:")
         for error in errors:
             print(error)
+        sys.exit(1)
 
 if __name__ == "__main__":
-    verify_locales()
+    main()
@@ -0,0 +1,40 @@
+"""
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from locale_keys import KeyIndex  # noqa: E402
+
+
+class SetTest(unittest.TestCase):
+    def test_string_over_section_drops_its_keys(self):
+        index = KeyIndex({'a': {'b': '1', 'c': {'d': '2'}}, 'e': '3'})
+        index.set('a', 'flat')
+        self.assertEqual(index.tree, {'a': 'flat', 'e': '3'})
+        self.assertEqual(sorted(index.keys()), ['a', 'e'])
+        self.assertIsNone(index.get('a.b'))
+        self.assertEqual(index.flat(), {'a': 'flat', 'e': '3'})
+        index.set('a.b', 'nested')
+        self.assertEqual(index.tree, {'a': {'b': 'nested'}, 'e': '3'})
+
+
+class DeleteTest(unittest.TestCase):
+    def test_legacy_flat_key(self):
+        index = KeyIndex({'foo.bar': 'x'})
+        self.assertTrue(index.delete('foo.bar'))
+        self.assertEqual(index.tree, {})
+
+    def test_nested_key_with_flat_duplicate(self):
+        index = KeyIndex({'a': {'b': 'n'}, 'a.b': 'flat', 'c': '1'})
+        self.assertTrue(index.delete('a.b'))
+        self.assertEqual(index.tree, {'c': '1'})
+        self.assertNotIn('a.b', index)
+        self.assertEqual(index.normalize(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from sound_changes import Cascade, RuleError  # noqa: E402
+
+
+class TargetListTest(unittest.TestCase):
+    def test_longer_target_is_tried_first(self):
+        self.assertEqual(Cascade(['t ts > d dz']).apply('tsat'), 'dzad')
+        self.assertEqual(Cascade(['k kʰ > g x']).apply('kʰak'), 'xag')
+
+
+class SetReplacementTest(unittest.TestCase):
+    def test_set_maps_member_by_member(self):
+        self.assertEqual(Cascade(['[ptk] > [bdg]']).apply('pat'), 'bad')
+        self.assertEqual(Cascade(['[ptk] > [bdg] / _#']).apply('pat'), 'pad')
+
+    def test_brace_set_prefers_longest_member(self):
+        self.assertEqual(Cascade(['{t,ts,k} > {d,dz,∅} / V_']).apply('atsaka'), 'adzaa')
+
+    def test_set_without_matching_target_set_is_rejected(self):
+        for rule in ('[ptk] > [bd]', 'p > [bd]', 'p > a[b]'):
+            with self.assertRaises(RuleError):
+                Cascade([rule])
+
+
+if __name__ == '__main__':
+    unittest.main()
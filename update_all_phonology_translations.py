@@ -1,7 +1,9 @@
-import json
+import sys
 from pathlib import Path
 
-LOCALES_DIR = r"c:\Users\LENOVO\OneDrive\Documentos\KL\KoreLang-1.1.1\KoreLang-Language_update\src\locales"
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+import locale_registry  # noqa: E402
+from locale_catalog import LocaleCatalog, set_value  # noqa: E402
 
 # TODOS los 45 idiomas con traducciones completas
 NEW_TRANSLATIONS = {
@@ -329,51 +331,32 @@ NEW_TRANSLATIONS = {
     }
 }
 
-ALL_LOCALES = [
-    "ar", "bn", "cs", "de", "el", "en", "es", "fa", "fi", "fr", "gu", 
-    "ha", "he", "hi", "hu", "id", "it", "ja", "jv", "kn", "ko", "ml", 
-    "mr", "ms", "nl", "pa", "pcm", "pl", "pt", "ro", "ru", "sr", "sv", 
-    "sw", "ta", "te", "th", "tl", "tr", "uk", "ur", "vi", "wuu", "yue",
-    "zh-tw", "zh"
-]
+ALL_LOCALES = locale_registry.CODES
 
 def update_all_translations():
     print("Actualizando TODAS las traducciones a los idiomas nativos...")
-    
+
+    catalog = LocaleCatalog(codes=ALL_LOCALES)
+
+    # Sobrescribir si existe o agregar si no existe (solo si es diferente)
+    keys = {key for translations in NEW_TRANSLATIONS.values() for key in translations}
+    operations = [
+        set_value(key, {locale: t[key] for locale, t in NEW_TRANSLATIONS.items() if key in t})
+        for key in sorted(keys)
+    ]
+    changes = catalog.apply(operations)
+
     for locale in ALL_LOCALES:
-        file_path = Path(LOCALES_DIR) / f"{locale}.json"
-        
-        if not file_path.exists():
+        if locale not in catalog:
             print(f"⚠ {locale}.json no existe")
-            continue
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Obtener traducciones para este idioma
-        if locale in NEW_TRANSLATIONS:
-            translations = NEW_TRANSLATIONS[locale]
-            updated = 0
-            
-            for key, value in translations.items():
-                # Sobrescribir si existe o agregar si no existe
-                if key in data:
-                    if data[key] != value:  # Solo actualizar si es diferente
-                        data[key] = value
-                        updated += 1
-                else:
-                    data[key] = value
-                    updated += 1
-            
-            if updated > 0:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-                print(f"✓ {locale}.json: actualizadas {updated} traducciones")
-            else:
-                print(f"  {locale}.json: ya actualizado")
-        else:
+        elif locale not in NEW_TRANSLATIONS:
             print(f"⚠ {locale}: No hay traducciones definidas")
-    
+        elif locale in changes:
+            print(f"✓ {locale}.json: actualizadas {changes[locale]} traducciones")
+        else:
+            print(f"  {locale}.json: ya actualizado")
+
+    catalog.flush()
     print("\n✓ ¡Todas las traducciones actualizadas!")
 
 if __name__ == "__main__":
@@ -1,23 +1,20 @@
-import os
+import sys
+from pathlib import Path
 
-locale_dir = "src/locales"
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from locale_catalog import LocaleCatalog  # noqa: E402
 
-for filename in os.listdir(locale_dir):
-    if filename.endswith(".json"):
-        filepath = os.path.join(locale_dir, filename)
-        
-        # Read content
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # Replace settings.light with settings.cappuccino
-        content = content.replace('"settings.light"', '"settings.cappuccino"')
-        
-        # Write back
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
-        
-        print(f"Updated {filename}")
+catalog = LocaleCatalog()
 
-print("Done!")
+for code in catalog.codes:
+    # Rename settings.light to settings.cappuccino
+    value = catalog.get(code, "settings.light")
+    if value is None:
+        continue
+    catalog.delete(code, "settings.light")
+    catalog.set(code, "settings.cappuccino", value, overwrite=False)
+
+for code in catalog.flush():
+    print(f"Updated {code}.json")
 
+print("Done!")